@@ -1,14 +1,85 @@
 #!/usr/bin/env python3
 
+import hashlib
 import json
 import logging
+import operator
 import os
-from typing import Any, Dict, List
+import re
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Prefer orjson for JSON columns; both branches emit sorted keys, compact separators and raw
+# UTF-8, so stored values compare equal except for exponent floats (1e20 vs 1e+20) and NaN
+# (null vs NaN), which count as changed once when the serializer changes. Values orjson
+# rejects, such as integers wider than 64 bits, are written by the standard library.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so either loader raises the same error.
+try:
+    import orjson
+
+    def _dumps(value: Any) -> str:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(value: Any) -> str:
+        return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+    _loads = json.loads
+
+# Optional incremental parser for input files too large to hold in memory
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Optional client-side filter of stored unique keys, used to skip lookups for new records
+try:
+    from pybloom_live import ScalableBloomFilter
+except ImportError:
+    ScalableBloomFilter = None
+
+# 8-byte digest of a serialized JSON column, stored in its optional "<column>_hash" companion
+try:
+    import xxhash
+
+    def _hash(serialized: str) -> bytes:
+        return xxhash.xxh3_64_digest(serialized.encode())
+except ImportError:
+    def _hash(serialized: str) -> bytes:
+        return hashlib.blake2b(serialized.encode(), digest_size=8).digest()
+
+# Table and column names are interpolated into SQL, so only plain identifiers are accepted
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z_0-9]*")
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Bound parameters per statement on older SQLite builds (SQLITE_MAX_VARIABLE_NUMBER)
+SQLITE_MAX_VARIABLES = 999
+
+# Tables processed concurrently by insert_data, each on its own connection
+MAX_TABLE_WORKERS = 4
+
+# Input files above this size are streamed with ijson (when installed) instead of loaded whole
+STREAMING_THRESHOLD_BYTES = 256 * 1024 * 1024
+
+# Row builders generated per table for distinct record key layouts; further layouts are built uncompiled
+MAX_ROW_BUILDERS = 64
+
+# Records per insert_batch call when streaming
+STREAM_BATCH_SIZE = 5000
+
+# Sizing of the per-table bloom filters of stored unique keys
+KEY_FILTER_CAPACITY = 100_000
+KEY_FILTER_ERROR_RATE = 0.001
+
 # Assume insightsdb is an existing module with the InsightsDB class
 # Replace the following import with the actual import statement as per your project structure
 # For example:
@@ -21,33 +92,76 @@ logger = logging.getLogger(__name__)
 class insightsdb:
     def __init__(self):
         # Initialize your actual database connection here
-        import sqlite3
-        self.connection = sqlite3.connect('data.db')  # Replace with actual DB
-        self.connection.row_factory = sqlite3.Row
+        # Room for the per-table SELECT/INSERT/UPDATE statements DataInserter reuses
+        # Concurrent table batches wait up to 60s for the single WAL writer lock
+        self.connection = sqlite3.connect('data.db', timeout=60, cached_statements=256)  # Replace with actual DB
+        # WAL with synchronous=NORMAL only fsyncs at checkpoints instead of on every commit;
+        # the larger page cache and mmap keep the unique-key index lookups in memory
+        self.connection.executescript(
+            "PRAGMA journal_mode=WAL;"
+            "PRAGMA synchronous=NORMAL;"
+            "PRAGMA temp_store=MEMORY;"
+            "PRAGMA cache_size=-65536;"
+            "PRAGMA mmap_size=268435456;"
+        )
+        # Rows come back as plain tuples; callers index them against their SELECT column order
         self.cursor = self.connection.cursor()
 
-    def _execute(self, query: str, params: tuple = ()) -> List[sqlite3.Row]:
+    def fetch(self, query: str, params: tuple = ()) -> List[tuple]:
         """
-        Execute a SQL query with optional parameters.
+        Execute a SELECT query with optional parameters.
+
+        sqlite3.Error propagates to the caller, which decides what to roll back.
 
         :param query: SQL query to execute.
         :param params: Tuple of parameters to pass with the query.
-        :return: List of sqlite3.Row objects for SELECT queries, empty list otherwise.
+        :return: List of row tuples.
         """
-        try:
-            self.cursor.execute(query, params)
-            self.connection.commit()
-            if query.strip().upper().startswith("SELECT"):
-                return self.cursor.fetchall()
-            return []
-        except sqlite3.Error as e:
-            logger.error(f"Database error: {e}")
-            return []
+        return self.cursor.execute(query, params).fetchall()
+
+    def write(self, query: str, params: tuple = ()) -> int:
+        """
+        Execute an INSERT/UPDATE query with optional parameters.
+
+        Writes are not committed here; callers commit once per record or per batch.
+        sqlite3.Error propagates to the caller, which decides what to roll back.
+
+        :param query: SQL query to execute.
+        :param params: Tuple of parameters to pass with the query.
+        :return: Number of rows changed.
+        """
+        return self.cursor.execute(query, params).rowcount
+
+    def rollback(self):
+        """Roll back the current transaction."""
+        self.connection.rollback()
+
+    def begin(self):
+        """Start a write transaction, taking the write lock up front."""
+        self.connection.execute("BEGIN IMMEDIATE")
+
+    def commit(self):
+        """Commit the current transaction."""
+        self.connection.commit()
 
     def close(self):
         """Close the database connection."""
         self.connection.close()
 
+class _KeyValues:
+    """
+    A record's unique key values for log messages, formatted as a key dict only when a message is emitted.
+    """
+
+    __slots__ = ("keys", "values")
+
+    def __init__(self, keys: List[str], values: tuple):
+        self.keys = keys
+        self.values = values
+
+    def __str__(self) -> str:
+        return str(dict(zip(self.keys, self.values)))
+
 class DataInserter:
     """
     Class responsible for inserting and updating data into the database using InsightsDB.
@@ -84,6 +198,170 @@ class DataInserter:
             }
         }
 
+        for table_name, config in self.table_configs.items():
+            for name in (table_name, *config["unique_keys"], *config["excluded_columns"], *config["json_columns"]):
+                self.validate_identifier(name)
+            table_columns = self.table_columns(table_name)
+            # Membership tests on the hot path are set lookups; json_columns keeps its list order
+            config["excluded_columns"] = frozenset(config["excluded_columns"])
+            config["json_columns_set"] = frozenset(config["json_columns"])
+            # JSON columns whose table has a "<column>_hash" companion are diffed by digest,
+            # so the batch lookup never has to read the full JSON text back
+            config["hashed_columns"] = frozenset(
+                column for column in config["json_columns"] if f"{column}_hash" in table_columns
+            )
+            # Columns a record may write, in table order; digests are derived, never read from the record
+            hash_columns = {f"{column}_hash" for column in config["hashed_columns"]}
+            config["writable_columns"] = tuple(
+                column for column in table_columns
+                if column not in config["excluded_columns"] and column not in hash_columns
+            )
+            # Key extraction is a single C-level itemgetter call that always yields a tuple
+            config["where_clause"] = " AND ".join([f"{key} = ?" for key in config["unique_keys"]])
+            config["key_getter"] = self.build_key_getter(config["unique_keys"])
+            # With a unique index on the keys, single records are written with one UPSERT
+            config["upsert"] = self.ensure_unique_index(table_name, config["unique_keys"])
+
+        # SQL strings are built once per table (and per column set) and reused, so
+        # sqlite3's statement cache hands back the already-prepared statement
+        self._stmts = {table: self.build_statements(table, config) for table, config in self.table_configs.items()}
+
+        # Bloom filters of each table's stored unique keys, built on the table's first batch
+        self._key_filters: Dict[str, Any] = {}
+
+        # Generated row builders per table, keyed by the record's key layout (see compile_row_builder)
+        self._builders: Dict[str, Dict[Tuple[str, ...], Tuple[Tuple[str, ...], Callable]]] = {
+            table: {} for table in self.table_configs
+        }
+
+    @staticmethod
+    def validate_identifier(name: str) -> str:
+        """
+        Check that a table or column name is safe to interpolate into SQL.
+
+        :param name: The identifier to check.
+        :return: The identifier, unchanged.
+        :raises ValueError: If the name is not a plain SQL identifier.
+        """
+        if not _IDENTIFIER.fullmatch(name):
+            raise ValueError(f"Invalid SQL identifier: {name!r}")
+        return name
+
+    @staticmethod
+    def build_key_getter(unique_keys: List[str]) -> Callable[[Dict[str, Any]], tuple]:
+        """
+        Build a function returning a record's unique key values as a tuple.
+
+        :param unique_keys: The table's unique key columns.
+        :return: Function raising KeyError with the missing key name, like a dict lookup.
+        """
+        getter = operator.itemgetter(*unique_keys)
+        if len(unique_keys) == 1:
+            return lambda record: (getter(record),)
+        return getter
+
+    def table_columns(self, table_name: str) -> List[str]:
+        """
+        Return the table's column names in declaration order (empty if the table does not exist).
+
+        :param table_name: Name of the table.
+        :return: List of column names.
+        """
+        return [row[1] for row in self.db.cursor.execute(f"PRAGMA table_info({table_name});").fetchall()]
+
+    def ensure_unique_index(self, table_name: str, unique_keys: List[str]) -> bool:
+        """
+        Create a unique index on the table's unique keys if it does not exist yet.
+
+        :param table_name: Name of the table.
+        :param unique_keys: The table's unique key columns.
+        :return: True if the index exists, False if it could not be created (e.g. duplicate rows).
+        """
+        try:
+            with self.db.connection:
+                self.db.cursor.execute(
+                    f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{table_name}_uk ON {table_name} ({', '.join(unique_keys)});"
+                )
+            return True
+        except sqlite3.Error as e:
+            logger.warning(f"Could not create unique index on '{table_name}': {e}. Falling back to SELECT before write.")
+            return False
+
+    def build_statements(self, table_name: str, config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build the fixed SQL for a table and the caches for its column-set dependent SQL.
+
+        :param table_name: Name of the table.
+        :param config: The table's configuration.
+        :return: Dictionary with the diff columns, the SELECT and empty INSERT/UPDATE/probe caches.
+        """
+        where_clause = config["where_clause"]
+        # Only what records_differ reads: the JSON columns, or their digest when hashed
+        diff_columns = [
+            f"{column}_hash" if column in config["hashed_columns"] else column for column in config["json_columns"]
+        ]
+        return {
+            "diff_columns": diff_columns,
+            # Without JSON columns there is nothing to diff, so the lookup is a bare existence probe
+            "select": sys.intern(f"SELECT {', '.join(diff_columns) or '1'} FROM {table_name} WHERE {where_clause} LIMIT 1;"),
+            "insert": {},
+            "update": {},
+            "upsert": {},
+            "probe": {},
+        }
+
+    def insert_statement(self, table_name: str, columns: Tuple[str, ...]) -> str:
+        """
+        Return the cached INSERT statement for the given column order, building it on first use.
+        """
+        statements = self._stmts[table_name]["insert"]
+        query = statements.get(columns)
+        if query is None:
+            query = statements[columns] = sys.intern(
+                f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({', '.join(['?'] * len(columns))});"
+            )
+        return query
+
+    def update_statement(self, table_name: str, columns: Tuple[str, ...]) -> str:
+        """
+        Return the cached UPDATE statement for the given column order, building it on first use.
+        """
+        statements = self._stmts[table_name]["update"]
+        query = statements.get(columns)
+        if query is None:
+            query = statements[columns] = sys.intern(
+                f"UPDATE {table_name} SET {', '.join(f'{column} = ?' for column in columns)} "
+                f"WHERE {self.table_configs[table_name]['where_clause']};"
+            )
+        return query
+
+    def upsert_statement(self, table_name: str, columns: Tuple[str, ...]) -> str:
+        """
+        Return the cached UPSERT statement for the given column order, building it on first use.
+
+        The DO UPDATE only fires when a diffed column (JSON text or digest) changed,
+        matching the skip-if-unchanged behaviour of the SELECT path.
+        """
+        statements = self._stmts[table_name]["upsert"]
+        query = statements.get(columns)
+        if query is None:
+            unique_keys = self.table_configs[table_name]["unique_keys"]
+            diff_columns = [column for column in self._stmts[table_name]["diff_columns"] if column in columns]
+            conflict_action = "DO NOTHING"
+            if diff_columns:
+                assignments = ", ".join(
+                    f"{column} = excluded.{column}" for column in columns if column not in unique_keys
+                )
+                change_predicate = " OR ".join(
+                    f"{table_name}.{column} IS NOT excluded.{column}" for column in diff_columns
+                )
+                conflict_action = f"DO UPDATE SET {assignments} WHERE {change_predicate}"
+            query = statements[columns] = sys.intern(
+                f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({', '.join(['?'] * len(columns))}) "
+                f"ON CONFLICT ({', '.join(unique_keys)}) {conflict_action};"
+            )
+        return query
+
     def serialize_field(self, value: Any) -> str:
         """
         Serialize a field to JSON if it's a dict or list, else return as string.
@@ -92,26 +370,158 @@ class DataInserter:
         :return: Serialized JSON string or string representation of the value.
         """
         if isinstance(value, (dict, list)):
-            return json.dumps(value)
+            return _dumps(value)
         elif value is None:
             return ""
         else:
             return str(value)
 
-    def records_differ(self, existing_record: Dict[str, Any], new_record: Dict[str, Any], json_columns: List[str]) -> bool:
+    def written_columns(self, table_name: str, record: Dict[str, Any]) -> List[str]:
+        """
+        Return the record's columns that are written, in the table's declaration order.
+
+        Unknown tables have no declared columns, so the record's own order is used,
+        keeping only keys that are safe to use as column names.
+
+        :param table_name: Name of the table.
+        :param record: Dictionary containing column-value pairs.
+        :return: List of the written columns, without the "<column>_hash" companions.
+        """
+        config = self.table_configs[table_name]
+        writable_columns = config["writable_columns"] or [
+            column for column in record if column not in config["excluded_columns"] and _IDENTIFIER.fullmatch(column)
+        ]
+
+        unknown_columns = record.keys() - config["excluded_columns"] - set(writable_columns)
+        if unknown_columns:
+            logger.warning("Ignoring columns not in table '%s': %s", table_name, sorted(unknown_columns))
+
+        return [column for column in writable_columns if column in record]
+
+    def compile_row_builder(self, table_name: str, record: Dict[str, Any]) -> Tuple[Tuple[str, ...], Callable]:
+        """
+        Generate a function building the bind values for records shaped like this one.
+
+        Columns follow the table's declaration order, so records with the same key set
+        always map to the same cached statement. Layouts without JSON columns use a plain
+        itemgetter over the columns; otherwise the generated source reads each column by
+        literal key and bakes in JSON serialization and digests, so building a row
+        involves no per-column membership checks.
+
+        :param table_name: Name of the table.
+        :param record: A record with the key layout to compile for.
+        :return: Tuple of (columns, builder returning the bind values for a record).
+        """
+        config = self.table_configs[table_name]
+        json_columns = config["json_columns_set"]
+        hashed_columns = config["hashed_columns"]
+
+        columns = []
+        statements = []
+        value_exprs = []
+        for column in self.written_columns(table_name, record):
+            columns.append(column)
+            if column in json_columns:
+                name = f"s{len(statements)}"
+                statements.append(f"    {name} = serialize(record[{column!r}])")
+                value_exprs.append(name)
+                if column in hashed_columns:
+                    columns.append(f"{column}_hash")
+                    value_exprs.append(f"digest({name})")
+            else:
+                value_exprs.append(f"record[{column!r}]")
+
+        if not statements and columns:
+            return tuple(columns), self.build_key_getter(columns)
+        source = "\n".join(
+            ["def build_row(record):", *statements, f"    return ({''.join(f'{expr}, ' for expr in value_exprs)})"]
+        )
+        namespace = {"serialize": self.serialize_field, "digest": _hash}
+        exec(compile(source, f"<row builder {table_name}>", "exec"), namespace)
+        return tuple(columns), namespace["build_row"]
+
+    def row_values(self, table_name: str, record: Dict[str, Any]) -> Tuple[Tuple[str, ...], tuple]:
+        """
+        Build the column names and bind values used to write a record.
+
+        JSON columns are serialized, and hashed JSON columns also write their digest.
+
+        :param table_name: Name of the table.
+        :param record: Dictionary containing column-value pairs.
+        :return: Tuple of (columns, values) in the same order.
+        """
+        builders = self._builders[table_name]
+        layout = tuple(record)
+        builder = builders.get(layout)
+        if builder is None:
+            if len(builders) >= MAX_ROW_BUILDERS:
+                # Compiling a builder that cannot be cached costs more than building this one row
+                return self.build_row_values(table_name, record)
+            builder = builders[layout] = self.compile_row_builder(table_name, record)
+        columns, build_row = builder
+        return columns, build_row(record)
+
+    def build_row_values(self, table_name: str, record: Dict[str, Any]) -> Tuple[Tuple[str, ...], tuple]:
+        """
+        Build the column names and bind values for a record without a generated row builder.
+
+        :param table_name: Name of the table.
+        :param record: Dictionary containing column-value pairs.
+        :return: Tuple of (columns, values) in the same order, as compile_row_builder's builders return them.
+        """
+        config = self.table_configs[table_name]
+        json_columns = config["json_columns_set"]
+        hashed_columns = config["hashed_columns"]
+
+        columns = []
+        values = []
+        for column in self.written_columns(table_name, record):
+            columns.append(column)
+            if column in json_columns:
+                serialized = self.serialize_field(record[column])
+                values.append(serialized)
+                if column in hashed_columns:
+                    columns.append(f"{column}_hash")
+                    values.append(_hash(serialized))
+            else:
+                values.append(record[column])
+        return tuple(columns), tuple(values)
+
+    def diff_values(self, record: Dict[str, Any], json_columns: List[str],
+                    hashed_columns: frozenset = frozenset()) -> tuple:
+        """
+        Build the values records_differ compares, aligned with the table's diff columns.
+
+        :param record: Dictionary containing column-value pairs.
+        :param json_columns: List of columns that contain JSON data.
+        :param hashed_columns: JSON columns compared through their "<column>_hash" digest.
+        :return: Tuple with the serialized JSON (or its digest) for each JSON column.
+        """
+        values = []
+        for column in json_columns:
+            serialized = self.serialize_field(record.get(column, ""))
+            values.append(_hash(serialized) if column in hashed_columns else serialized)
+        return tuple(values)
+
+    def records_differ(self, existing_row: tuple, new_record: Dict[str, Any], json_columns: List[str],
+                       hashed_columns: frozenset = frozenset()) -> bool:
         """
         Compare JSON fields between existing and new records to determine if they differ.
 
-        :param existing_record: The existing record from the database as a dictionary.
+        :param existing_row: The existing row's diff columns, in json_columns order.
         :param new_record: The new record to compare.
         :param json_columns: List of columns that contain JSON data.
+        :param hashed_columns: JSON columns compared through their stored "<column>_hash" digest.
         :return: True if any JSON field differs, False otherwise.
         """
-        for column in json_columns:
-            existing_value = existing_record.get(column, "")
-            new_value = self.serialize_field(new_record.get(column, ""))
+        new_values = self.diff_values(new_record, json_columns, hashed_columns)
+        for column, existing_value, new_value in zip(json_columns, existing_row, new_values):
             if existing_value != new_value:
-                logger.debug(f"Difference found in column '{column}': existing='{existing_value}' vs new='{new_value}'")
+                # Guarded so multi-KB JSON values are never formatted unless DEBUG is on
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "Difference found in column '%s': existing='%s' vs new='%s'", column, existing_value, new_value
+                    )
                 return True
         return False
 
@@ -124,101 +534,291 @@ class DataInserter:
         """
         config = self.table_configs.get(table_name)
         if not config:
-            logger.warning(f"No configuration found for table '{table_name}'. Skipping record.")
+            logger.warning("No configuration found for table '%s'. Skipping record.", table_name)
             return
 
         unique_keys = config["unique_keys"]
-        excluded_columns = config["excluded_columns"]
         json_columns = config.get("json_columns", [])
 
         # Extract unique key values
         try:
-            unique_values = {key: record[key] for key in unique_keys}
+            where_values = config["key_getter"](record)
         except KeyError as ke:
-            logger.error(f"Missing unique key '{ke.args[0]}' for table '{table_name}'. Record: {record}. Skipping.")
+            logger.error("Missing unique key '%s' for table '%s'. Record: %s. Skipping.", ke.args[0], table_name, record)
             return
+        # Formatted as a readable key dict only when a message is actually emitted
+        unique_values = _KeyValues(unique_keys, where_values)
 
-        # Construct WHERE clause for unique keys
-        where_clause = " AND ".join([f"{key} = ?" for key in unique_keys])
-        where_values = tuple(unique_values[key] for key in unique_keys)
+        if config["upsert"]:
+            upsert_fields, upsert_values = self.row_values(table_name, record)
+            try:
+                changed = self.db.write(self.upsert_statement(table_name, upsert_fields), upsert_values)
+                self.db.commit()
+            except sqlite3.Error as e:
+                self.db.rollback()
+                logger.error("Error upserting record into '%s': %s", table_name, e)
+                return
+            if changed:
+                logger.info("Inserted or updated record in '%s': %s", table_name, unique_values)
+            else:
+                logger.info("No changes detected for record in '%s': %s. Skipping update.", table_name, unique_values)
+            return
 
-        # Check if record exists
-        select_query = f"SELECT * FROM {table_name} WHERE {where_clause} LIMIT 1;"
+        # Check if record exists, fetching only the columns needed to diff it
         try:
-            result = self.db._execute(select_query, where_values)
-        except Exception as e:
-            logger.error(f"Error executing SELECT for table '{table_name}': {e}")
+            result = self.db.fetch(self._stmts[table_name]["select"], where_values)
+        except sqlite3.Error as e:
+            logger.error("Error executing SELECT for table '%s': %s", table_name, e)
             return
 
         if result:
-            # Assuming db._execute returns a list of sqlite3.Row objects
-            existing_record = dict(result[0])  # Convert sqlite3.Row to dict
+            existing_row = result[0]
             # Check if JSON fields differ
-            if self.records_differ(existing_record, record, json_columns):
+            if self.records_differ(existing_row, record, json_columns, config["hashed_columns"]):
                 # Prepare fields for update
-                update_fields = []
-                update_values = []
-                for column, value in record.items():
-                    if column in excluded_columns:
-                        continue  # Skip excluded columns
-                    if column in json_columns:
-                        serialized = self.serialize_field(value)
-                        update_fields.append(f"{column} = ?")
-                        update_values.append(serialized)
-                    else:
-                        update_fields.append(f"{column} = ?")
-                        update_values.append(value)
-
-                update_values.extend([unique_values[key] for key in unique_keys])
-
-                update_query = f"UPDATE {table_name} SET {', '.join(update_fields)} WHERE {where_clause};"
+                update_fields, update_values = self.row_values(table_name, record)
+                update_query = self.update_statement(table_name, update_fields)
                 try:
-                    self.db._execute(update_query, tuple(update_values))
-                    logger.info(f"Updated record in '{table_name}': {unique_values}")
-                except Exception as e:
-                    logger.error(f"Error updating record in '{table_name}': {e}")
+                    self.db.write(update_query, update_values + where_values)
+                    self.db.commit()
+                    logger.info("Updated record in '%s': %s", table_name, unique_values)
+                except sqlite3.Error as e:
+                    self.db.rollback()
+                    logger.error("Error updating record in '%s': %s", table_name, e)
             else:
-                logger.info(f"No changes detected for record in '{table_name}': {unique_values}. Skipping update.")
+                logger.info("No changes detected for record in '%s': %s. Skipping update.", table_name, unique_values)
         else:
             # Prepare fields for insertion
-            insert_fields = []
-            insert_placeholders = []
-            insert_values = []
-            for column, value in record.items():
-                if column in excluded_columns:
-                    continue  # Skip excluded columns
-                insert_fields.append(column)
-                insert_placeholders.append("?")
-                if column in json_columns:
-                    serialized = self.serialize_field(value)
-                    insert_values.append(serialized)
-                else:
-                    insert_values.append(value)
+            insert_fields, insert_values = self.row_values(table_name, record)
+            insert_query = self.insert_statement(table_name, insert_fields)
+            try:
+                self.db.write(insert_query, insert_values)
+                self.db.commit()
+                logger.info("Inserted new record into '%s': %s", table_name, unique_values)
+            except sqlite3.Error as e:
+                self.db.rollback()
+                logger.error("Error inserting record into '%s': %s", table_name, e)
+
+    @staticmethod
+    def key_digest(key: Tuple) -> bytes:
+        """
+        Digest a unique key tuple for the key filter.
+
+        Values are compared as text so keys read back from SQLite match the same keys
+        parsed from JSON (e.g. 1 and '1' in a TEXT column).
+        """
+        return _hash(repr(tuple(str(value) for value in key)))
+
+    def key_filter(self, table_name: str, db: insightsdb) -> Optional[Any]:
+        """
+        Return the bloom filter of the table's stored unique keys, loading it on first use.
+
+        Only available when pybloom_live is installed and the table has a unique index:
+        records the filter reports as new are written with the UPSERT statement, so a
+        key that does exist after all is still updated rather than duplicated.
+
+        :param table_name: Name of the table.
+        :param db: Connection to read the stored keys from.
+        :return: The filter, or None when disabled for this table.
+        """
+        if ScalableBloomFilter is None or not self.table_configs[table_name]["upsert"]:
+            return None
+        key_filter = self._key_filters.get(table_name)
+        if key_filter is None:
+            key_filter = ScalableBloomFilter(initial_capacity=KEY_FILTER_CAPACITY, error_rate=KEY_FILTER_ERROR_RATE)
+            unique_keys = self.table_configs[table_name]["unique_keys"]
+            for key in db.cursor.execute(f"SELECT {', '.join(unique_keys)} FROM {table_name};"):
+                key_filter.add(self.key_digest(key))
+            self._key_filters[table_name] = key_filter
+        return key_filter
+
+    def fetch_existing_records(self, table_name: str, keys: List[Tuple], db: insightsdb) -> Dict[Tuple, tuple]:
+        """
+        Fetch the stored JSON columns for a batch of unique key tuples.
+
+        The keys are joined against the table as a VALUES list, so each chunk costs a
+        single SELECT no matter how many records it covers. Hashed JSON columns fetch
+        only their digest.
+
+        :param table_name: Name of the table.
+        :param keys: Distinct unique key tuples to look up.
+        :param db: Connection to read from.
+        :return: Dictionary mapping each found key tuple to its diff columns, in json_columns order.
+        """
+        unique_keys = self.table_configs[table_name]["unique_keys"]
+        diff_columns = self._stmts[table_name]["diff_columns"]
+        chunk_size = max(1, SQLITE_MAX_VARIABLES // (len(unique_keys) + 1))
+        statements = self._stmts[table_name]["probe"]
+
+        existing = {}
+        for start in range(0, len(keys), chunk_size):
+            chunk = keys[start:start + chunk_size]
+            select_query = statements.get(len(chunk))
+            if select_query is None:
+                select_columns = "".join(f", {table_name}.{column}" for column in diff_columns)
+                join_clause = " AND ".join(
+                    f"{table_name}.{key} = probe.column{position + 2}" for position, key in enumerate(unique_keys)
+                )
+                row_placeholders = "(" + ", ".join(["?"] * (len(unique_keys) + 1)) + ")"
+                select_query = statements[len(chunk)] = sys.intern(
+                    f"SELECT probe.column1{select_columns} "
+                    f"FROM (VALUES {', '.join([row_placeholders] * len(chunk))}) AS probe "
+                    f"JOIN {table_name} ON {join_clause};"
+                )
+            params = tuple(value for position, key in enumerate(chunk) for value in (position, *key))
+            for row in db.cursor.execute(select_query, params).fetchall():
+                # Keep the first match per key, mirroring the per-record LIMIT 1
+                existing.setdefault(chunk[row[0]], row[1:])
+        return existing
+
+    def insert_batch(self, table_name: str, records: List[Dict[str, Any]], db: Optional[insightsdb] = None):
+        """
+        Insert or update a batch of records in the specified table.
+
+        Existing rows are looked up with one SELECT per chunk of keys, records are
+        classified into inserts and updates in Python, and the writes are issued with
+        executemany inside a single transaction. Keys the table's bloom filter has never
+        seen are not looked up at all.
 
-            insert_query = f"INSERT INTO {table_name} ({', '.join(insert_fields)}) VALUES ({', '.join(insert_placeholders)});"
+        :param table_name: Name of the table.
+        :param records: List of dictionaries containing column-value pairs.
+        :param db: Connection to use; defaults to the inserter's own connection.
+        """
+        config = self.table_configs.get(table_name)
+        if not config:
+            logger.warning("No configuration found for table '%s'. Skipping %d records.", table_name, len(records))
+            return
+        db = db or self.db
+
+        key_getter = config["key_getter"]
+        json_columns = config.get("json_columns", [])
+        hashed_columns = config["hashed_columns"]
+
+        # Extract unique key values
+        keyed_records = []
+        for record in records:
             try:
-                self.db._execute(insert_query, tuple(insert_values))
-                logger.info(f"Inserted new record into '{table_name}': {unique_values}")
-            except Exception as e:
-                logger.error(f"Error inserting record into '{table_name}': {e}")
+                key = key_getter(record)
+                # Keys are deduplicated and looked up in dicts below, so a list or dict value is rejected here
+                hash(key)
+            except KeyError as ke:
+                logger.error(
+                    "Missing unique key '%s' for table '%s'. Record: %s. Skipping.", ke.args[0], table_name, record
+                )
+                continue
+            except TypeError:
+                logger.error("Unhashable unique key values for table '%s'. Record: %s. Skipping.", table_name, record)
+                continue
+            keyed_records.append((key, record))
+
+        # Bound once so the per-record loop only touches locals
+        row_values = self.row_values
+        records_differ = self.records_differ
+        diff_values = self.diff_values
+        # Consecutive records with the same column set share one executemany call
+        insert_runs: List[Tuple[Tuple[str, ...], List[tuple]]] = []
+        update_runs: List[Tuple[Tuple[str, ...], List[tuple]]] = []
+        skipped = 0
+        # One try and one transaction (and one commit) for the whole table batch; any
+        # sqlite3.Error from the probe or the writes rolls the batch back as a unit
+        try:
+            probe_keys = list(dict.fromkeys(key for key, _ in keyed_records))
+            key_filter = self.key_filter(table_name, db)
+            if key_filter is not None:
+                probe_keys = [key for key in probe_keys if self.key_digest(key) in key_filter]
+            existing = self.fetch_existing_records(table_name, probe_keys, db)
+
+            lookup_existing = existing.get
+            for key, record in keyed_records:
+                columns, values = row_values(table_name, record)
+                existing_row = lookup_existing(key)
+                if existing_row is None:
+                    runs = insert_runs
+                    params = values
+                elif records_differ(existing_row, record, json_columns, hashed_columns):
+                    runs = update_runs
+                    params = values + key
+                else:
+                    skipped += 1
+                    continue
+
+                if runs and runs[-1][0] == columns:
+                    runs[-1][1].append(params)
+                else:
+                    runs.append((columns, [params]))
+                # Later duplicates of this key within the batch are diffed against this record
+                existing[key] = diff_values(record, json_columns, hashed_columns)
+
+            # The key filter only knows the keys stored when it was loaded plus those written here;
+            # another writer may have added a "new" record's key since, so with a filter they are upserted
+            insert_statement = self.insert_statement if key_filter is None else self.upsert_statement
+            executemany = db.cursor.executemany
+            # The write lock is only taken once classification is done, so other
+            # tables' threads can keep probing in the meantime
+            db.begin()
+            for columns, params in insert_runs:
+                executemany(insert_statement(table_name, columns), params)
+            for columns, params in update_runs:
+                executemany(self.update_statement(table_name, columns), params)
+            db.commit()
+        except sqlite3.Error as e:
+            db.rollback()
+            logger.error("Error writing batch to '%s': %s", table_name, e)
+            return
+
+        if key_filter is not None:
+            for key in existing:
+                key_filter.add(self.key_digest(key))
+
+        inserted = sum(len(params) for _, params in insert_runs)
+        updated = sum(len(params) for _, params in update_runs)
+        logger.info(
+            "Table '%s': inserted %d, updated %d, skipped %d unchanged records.", table_name, inserted, updated, skipped
+        )
+
+    def _insert_table_batch(self, table_name: str, records: List[Dict[str, Any]]):
+        """
+        Run insert_batch for one table on a dedicated connection (used by worker threads).
+
+        :param table_name: Name of the table.
+        :param records: List of dictionaries containing column-value pairs.
+        """
+        db = insightsdb()
+        try:
+            self.insert_batch(table_name, records, db)
+        finally:
+            db.close()
 
     def insert_data(self, data: Dict[str, List[Dict[str, Any]]]):
         """
         Insert or update records into their respective tables.
 
+        Tables are independent, so each one is processed on its own thread and
+        connection; SQLite's WAL writer lock is the only point where they serialize.
+
         :param data: Dictionary containing table names as keys and lists of records as values.
         """
+        batches = []
         for table_name, records in data.items():
             if not isinstance(records, list):
-                logger.warning(f"Data for table '{table_name}' is not a list. Skipping.")
+                logger.warning("Data for table '%s' is not a list. Skipping.", table_name)
                 continue
 
+            batch = []
             for record in records:
                 if not isinstance(record, dict):
-                    logger.warning(f"Record in table '{table_name}' is not a dictionary. Skipping.")
+                    logger.warning("Record in table '%s' is not a dictionary. Skipping.", table_name)
                     continue
+                batch.append(record)
 
-                self.insert_or_update_record(table_name, record)
+            batches.append((table_name, batch))
+
+        if not batches:
+            return
+        with ThreadPoolExecutor(max_workers=min(MAX_TABLE_WORKERS, len(batches))) as executor:
+            futures = [executor.submit(self._insert_table_batch, table_name, batch) for table_name, batch in batches]
+            for future in futures:
+                future.result()
 
     def close(self):
         """Close the database connection."""
@@ -237,8 +837,9 @@ def load_json_file(file_path: str) -> Dict[str, Any]:
         return {}
 
     try:
-        with open(file_path, 'r') as f:
-            data = json.load(f)
+        # Read raw bytes: orjson parses UTF-8 directly without decoding to str first
+        with open(file_path, 'rb') as f:
+            data = _loads(f.read())
         logger.info(f"Successfully loaded data from '{file_path}'.")
         return data
     except json.JSONDecodeError as e:
@@ -248,11 +849,51 @@ def load_json_file(file_path: str) -> Dict[str, Any]:
 
     return {}
 
+def iter_json_batches(file_path: str, table_names: List[str],
+                      batch_size: int = STREAM_BATCH_SIZE) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """
+    Stream records from a JSON file in batches without loading the whole document.
+
+    Requires ijson. The file is scanned once per table, so at most one batch of
+    records is held in memory at a time.
+
+    :param file_path: Path to the JSON file.
+    :param table_names: Tables whose record arrays should be read.
+    :param batch_size: Maximum number of records per yielded batch.
+    :return: Iterator of (table name, list of records) pairs.
+    """
+    for table_name in table_names:
+        with open(file_path, 'rb') as f:
+            batch = []
+            for record in ijson.items(f, f"{table_name}.item", use_float=True):
+                if not isinstance(record, dict):
+                    logger.warning("Record in table '%s' is not a dictionary. Skipping.", table_name)
+                    continue
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    yield table_name, batch
+                    batch = []
+            if batch:
+                yield table_name, batch
+
 def main():
     # Define the fixed path to perf_data.json relative to the script's directory
     script_dir = os.path.dirname(os.path.abspath(__file__))
     json_file_path = os.path.join(script_dir, 'perf_data.json')
 
+    # Stream very large inputs batch by batch instead of parsing them into memory at once
+    if (ijson is not None and os.path.isfile(json_file_path)
+            and os.path.getsize(json_file_path) > STREAMING_THRESHOLD_BYTES):
+        inserter = DataInserter()
+        logger.info("Streaming data from perf_data.json:")
+        try:
+            for table_name, batch in iter_json_batches(json_file_path, list(inserter.table_configs)):
+                inserter.insert_batch(table_name, batch)
+        except ijson.JSONError as e:
+            logger.error(f"Error decoding JSON from file '{json_file_path}': {e}")
+        inserter.close()
+        return
+
     # Load data from the specified JSON file
     data = load_json_file(json_file_path)
     if not data:
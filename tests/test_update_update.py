@@ -0,0 +1,144 @@
+import os
+import sys
+import types
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+class FakeConnection:
+    """Connection that, like PostgreSQL, refuses every statement after a failed one until rolled back."""
+
+    def __init__(self):
+        self.aborted = False
+        self.rollbacks = 0
+
+    def commit(self):
+        self.aborted = False
+
+    def rollback(self):
+        self.aborted = False
+        self.rollbacks += 1
+
+
+class FakeCursor:
+    """Cursor whose statements find no rows and fail when they mention a column named bogus."""
+
+    def __init__(self, connection: FakeConnection):
+        self.connection = connection
+
+    def execute(self, query, params=None):
+        if self.connection.aborted:
+            raise RuntimeError("current transaction is aborted, commands ignored until end of transaction block")
+        if isinstance(query, bytes):
+            query = query.decode()
+        if "bogus" in query:
+            self.connection.aborted = True
+            raise RuntimeError('column "bogus" does not exist')
+
+    def mogrify(self, query, params):
+        return query.encode()
+
+    def fetchall(self):
+        return []
+
+
+class FakeInsightsDB:
+    """Stand-in for InsightsDB on top of FakeConnection."""
+
+    def __init__(self):
+        self.cursor = FakeCursor(FakeConnection())
+
+    def _fetch_all(self, query, params=()):
+        self.cursor.execute(query, params)
+        return self.cursor.fetchall()
+
+    def _execute(self, query, params=()):
+        self.cursor.execute(query, params)
+        self.cursor.connection.commit()
+
+    def close(self):
+        pass
+
+
+database = types.ModuleType("src.database")
+database.insightsdb = FakeInsightsDB
+sys.modules.setdefault("src", types.ModuleType("src"))
+sys.modules["src.database"] = database
+
+import update_update  # noqa: E402
+
+
+class InsertManyTest(unittest.TestCase):
+    def setUp(self):
+        # The single-key bulk lookup binds an array through _fetch_all; execute_values only has to exist
+        patcher = mock.patch.object(update_update, "execute_values", mock.Mock())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.inserter = update_update.DataInserter(fast_mode=False)
+
+    def test_malformed_record_does_not_fail_the_rest_of_the_batch(self):
+        records = [{"test_request_id": f"t{i}", "report_doc": {"k": i}} for i in range(6)]
+        records.insert(2, {"test_request_id": "t-bad", "report_doc": {}, "bogus": 1})
+
+        self.inserter.insert_many("sevenps_result_set", records)
+
+        self.assertEqual(
+            self.inserter.table_stats["sevenps_result_set"],
+            {"total": 7, "insertions": 6, "updates": 0, "skips": 0, "failures": 1},
+        )
+        connection = self.inserter.db.cursor.connection
+        self.assertFalse(connection.aborted)
+        # Once for the bulk lookup, once for the malformed record's own SELECT
+        self.assertEqual(connection.rollbacks, 2)
+
+
+class UpsertManyTest(unittest.TestCase):
+    def setUp(self):
+        # Every row comes back from the UPSERT as inserted
+        patcher = mock.patch.object(
+            update_update, "execute_values",
+            mock.Mock(side_effect=lambda cursor, query, rows, **kwargs: [(True,)] * len(rows)),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.inserter = update_update.DataInserter()
+        self.inserter.table_configs["sevenps_result_set"]["upsert"] = True
+
+    def test_unhashable_key_counts_as_one_failure(self):
+        records = [{"test_request_id": ["a"], "report_doc": {}}, {"test_request_id": "b", "report_doc": {}}]
+
+        self.inserter.insert_many("sevenps_result_set", records)
+
+        self.assertEqual(
+            self.inserter.table_stats["sevenps_result_set"],
+            {"total": 2, "insertions": 1, "updates": 0, "skips": 0, "failures": 1},
+        )
+
+
+class RecordComparisonTest(unittest.TestCase):
+    def setUp(self):
+        self.inserter = update_update.DataInserter(fast_mode=False)
+        self.record = {
+            "jira_key": "J-1", "repo_url": "r", "summary": "s",
+            "issue_data": {"zeta": 1, "a": [1, 2], "bb": {"y": 1, "x": 2}},
+        }
+
+    def write_over(self, issue_data):
+        # A jsonb column comes back parsed, with its keys in jsonb's order rather than the input's
+        stored = dict(self.record, issue_data=issue_data)
+        self.inserter.insert_or_update_record("jira_issues", self.record, existing_records={("J-1", "r"): stored})
+        return self.inserter.table_stats["jira_issues"]
+
+    def test_identical_record_with_reordered_json_keys_is_skipped(self):
+        stats = self.write_over({"a": [1, 2], "bb": {"x": 2, "y": 1}, "zeta": 1})
+        self.assertEqual(stats, {"total": 1, "insertions": 0, "updates": 0, "skips": 1, "failures": 0})
+
+    def test_changed_json_document_is_updated(self):
+        stats = self.write_over({"a": [1, 2], "bb": {"x": 2, "y": 2}, "zeta": 1})
+        self.assertEqual(stats, {"total": 1, "insertions": 0, "updates": 1, "skips": 0, "failures": 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,10 +2,12 @@
 
 import sys
 import os
+import itertools
 import json
 import logging
+import operator
 import re
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterator, List, Tuple
 
 # Add project root to sys.path
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -22,6 +24,91 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Prefer orjson for parsing and serializing JSON, falling back to the standard library with the
+# same compact separators and unescaped UTF-8. The two still differ on exponent floats (1e20 vs
+# 1e+20) and NaN (null vs NaN), so documents holding those count as changed once when the
+# serializer changes. Values orjson rejects, such as integers wider than 64 bits, are written by
+# the standard library.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either the same way.
+# _dumps_bytes is the UTF-8 encoded form, used for bind values when available.
+try:
+    import orjson
+
+    def _dumps_bytes(value: Any) -> bytes:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode()
+
+    def _dumps(value: Any) -> str:
+        return _dumps_bytes(value).decode()
+
+    _loads = orjson.loads
+except ImportError:
+    _dumps_bytes = None
+
+    def _dumps(value: Any) -> str:
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+    _loads = json.loads
+
+# Optional SIMD parser for the input file; documents are built as plain dicts/lists,
+# since the rest of the script type-checks values as dict/list
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+# Optional incremental parser for input files too large to load at once
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Batched UPSERTs go through psycopg2's execute_values; without it every record takes the SELECT path
+try:
+    from psycopg2.extras import execute_values
+except ImportError:
+    execute_values = None
+
+
+class JsonLiteral:
+    """
+    Bind value for a JSON document that is already UTF-8 bytes (orjson's output).
+
+    psycopg2 sends plain bytes as bytea, so this adapter quotes them into the query as an
+    escaped E'' string literal instead, skipping the bytes -> str -> bytes round trip a str
+    value takes. Only valid on connections whose client encoding is UTF8.
+    """
+    __slots__ = ("raw",)
+
+    def __init__(self, raw: bytes):
+        self.raw = raw
+
+    def __conform__(self, protocol):
+        return self
+
+    def getquoted(self) -> bytes:
+        return b"E'" + self.raw.replace(b"\\", b"\\\\").replace(b"'", b"''") + b"'"
+
+# Rows sent per multi-row INSERT ... VALUES statement
+UPSERT_PAGE_SIZE = 1000
+
+# Input files above this size are streamed with ijson (when installed) instead of loaded whole
+STREAMING_THRESHOLD_BYTES = 256 * 1024 * 1024
+
+# Records per insert_many call when streaming
+STREAM_BATCH_SIZE = 1000
+
+# Byte table for the single-quote to double-quote fixup in normalize_json_value
+_SINGLE_TO_DOUBLE = bytes.maketrans(b"'", b'"')
+
+# Table names are interpolated into SQL, so only alphanumerics and underscores are accepted
+_TABLE_NAME_RE = re.compile(r"[A-Za-z0-9_]+")
+
+# $n placeholders of a prepared statement, numbered in the order they appear
+_PLACEHOLDER_RE = re.compile(r"\$\d+")
+
 def normalize_json_value(value_str: str) -> Any:
     """
     Attempt to parse a JSON string into a Python object.
@@ -34,15 +121,16 @@ def normalize_json_value(value_str: str) -> Any:
 
     # First attempt
     try:
-        return json.loads(value_str)
+        return _loads(value_str)
     except json.JSONDecodeError:
-        # Attempt to fix quotes by replacing single quotes with double quotes
-        fixed_str = value_str.replace("'", '"')
+        # Attempt to fix quotes by replacing single quotes with double quotes; both loaders
+        # accept UTF-8 bytes, so the fixup is a single bytes.translate pass
+        fixed = value_str.encode().translate(_SINGLE_TO_DOUBLE)
         try:
-            return json.loads(fixed_str)
+            return _loads(fixed)
         except json.JSONDecodeError:
             # Could not parse as JSON
-            logger.debug(f"Could not parse value as JSON: {value_str}")
+            logger.debug("Could not parse value as JSON: %s", value_str)
             return value_str
 
 def ensure_parsed_json(value: Any) -> Any:
@@ -62,11 +150,38 @@ def ensure_parsed_json(value: Any) -> Any:
         # Some other type (int, None, etc.), just return as is
         return value
 
+def strip_record_keys(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Return the record with leading and trailing spaces removed from its keys.
+    Keys are nearly always clean already, in which case the record itself is returned
+    instead of a rebuilt copy.
+    """
+    for key in record:
+        if key != key.strip():
+            return {k.strip(): v for k, v in record.items()}
+    return record
+
+def _stats_total(key: str, doc: str) -> property:
+    """
+    Build a read-only property summing one statistic over every table in table_stats.
+    """
+    return property(lambda self: sum(stats[key] for stats in self.table_stats.values()), doc=doc)
+
 class DataInserter:
     """
     Class responsible for inserting or updating data into the database using InsightsDB.
     """
 
+    # Fixed attribute layout: no per-instance __dict__
+    __slots__ = ("db", "table_configs", "table_stats", "json_bytes", "statement_ids")
+
+    # Overall counters are derived from table_stats, so every event is counted exactly once
+    total_records = _stats_total("total", "Total number of records processed.")
+    total_insertions = _stats_total("insertions", "Total number of records inserted.")
+    total_updates = _stats_total("updates", "Total number of records updated.")
+    total_skips = _stats_total("skips", "Total number of records skipped.")
+    total_failures = _stats_total("failures", "Total number of insert/update failures.")
+
     def __init__(self):
         """
         Initialize the DataInserter with an instance of InsightsDB.
@@ -98,25 +213,109 @@ class DataInserter:
             }
         }
 
-        # Initialize overall counters
-        self.total_records = 0
-        self.total_insertions = 0
-        self.total_updates = 0
-        self.total_skips = 0  # Total number of records skipped
-        self.total_failures = 0  # Total number of insert/update failures
-
-        # Initialize table-specific statistics
+        # Initialize table-specific statistics; the overall totals are summed from these
         self.table_stats = {
             table: {"total": 0, "insertions": 0, "updates": 0, "skips": 0, "failures": 0}
             for table in self.table_configs.keys()
         }
 
+        # JSON documents are bound as orjson bytes when the connection speaks UTF-8
+        self.json_bytes = (
+            _dumps_bytes is not None and execute_values is not None
+            and self.db.cursor.connection.encoding == "UTF8"
+        )
+
+        for table_name, config in self.table_configs.items():
+            # Invariant SQL pieces and membership sets, built once instead of for every record
+            config["unique_keys_tuple"] = tuple(config["unique_keys"])
+            config["unique_getter"] = self.build_getter(config["unique_keys_tuple"])
+            config["excluded_set"] = frozenset(config["excluded_columns"])
+            config["json_set"] = frozenset(config.get("json_columns", []))
+            # UPSERT statements by written column order, built on first use
+            config["upsert_statements"] = {}
+            # Prepared SELECT/INSERT, column positions and scalar getters by the record's key
+            # layout, and prepared UPDATEs by updated columns; built on first use
+            config["layouts"] = {}
+            config["updates"] = {}
+            # ON CONFLICT needs a unique index on exactly the unique keys; tables without one
+            # (or runs without psycopg2) keep the per-record SELECT-then-write path
+            config["upsert"] = execute_values is not None and self.has_unique_index(table_name, config["unique_keys"])
+
+        # Numbers for prepared statement names, never reused even when a PREPARE fails
+        self.statement_ids = itertools.count()
+
+    def prepare(self, table_name: str, statements: List[Tuple[str, str, int]]) -> List[str]:
+        """
+        Prepare (name prefix, statement, parameter count) triples on the server under unique
+        names, and return the EXECUTEs that run them with %s parameters.
+
+        Prepared statements live for the whole session (rollbacks do not drop them), so the
+        server parses and plans each one once and later records only send EXECUTE and
+        their values on the persistent cursor. The statements are prepared as a group: if
+        one fails, the ones already prepared are deallocated and the group's statements are
+        returned unprepared instead, with %s for their $n placeholders. The caller caches
+        them like EXECUTEs, so a statement that cannot be prepared is not retried, and
+        leaked, for every record.
+        """
+        cursor = self.db.cursor
+        connection = cursor.connection
+        names = []
+        try:
+            for prefix, statement, _ in statements:
+                name = f"{prefix}_{next(self.statement_ids)}"
+                cursor.execute(f"PREPARE {name} AS {statement}")
+                names.append(name)
+        except Exception as e:
+            connection.rollback()
+            logger.warning(f"Could not prepare statements for '{table_name}': {e}. Running them unprepared.")
+            try:
+                for name in names:
+                    cursor.execute(f"DEALLOCATE {name}")
+                connection.commit()
+            except Exception as deallocate_error:
+                connection.rollback()
+                logger.warning(f"Could not deallocate prepared statements {names}: {deallocate_error}")
+            return [f"{_PLACEHOLDER_RE.sub('%s', statement)};" for _, statement, _ in statements]
+        return [
+            f"EXECUTE {name} ({', '.join(['%s'] * param_count)});"
+            for name, (_, _, param_count) in zip(names, statements)
+        ]
+
+    @staticmethod
+    def numbered_where(unique_keys: Tuple[str, ...], start: int) -> str:
+        """
+        Build the unique-key WHERE clause with $n placeholders numbered from start, for prepared statements.
+        """
+        return " AND ".join(f"{key} = ${start + position}" for position, key in enumerate(unique_keys))
+
+    def has_unique_index(self, table_name: str, unique_keys: List[str]) -> bool:
+        """
+        Check whether the table has a non-partial unique index covering exactly the unique keys.
+        """
+        query = (
+            "SELECT 1 FROM pg_index i "
+            "WHERE i.indrelid = to_regclass(%s) AND i.indisunique AND i.indpred IS NULL "
+            "AND (SELECT array_agg(a.attname::text ORDER BY a.attname::text) FROM pg_attribute a "
+            "WHERE a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)) = %s::text[] LIMIT 1;"
+        )
+        try:
+            if self.db._fetch_all(query, (table_name, sorted(unique_keys))):
+                return True
+        except Exception as e:
+            # A failed query leaves the connection in an aborted transaction
+            self.db.cursor.connection.rollback()
+            logger.warning(f"Could not inspect indexes of '{table_name}': {e}")
+        logger.warning(
+            f"No unique index on {unique_keys} for table '{table_name}'. Falling back to SELECT before write."
+        )
+        return False
+
     def serialize_field(self, value: Any) -> str:
         """
         Serialize a field to JSON if it's a dict or list, else return as string.
         """
         if isinstance(value, (dict, list)):
-            return json.dumps(value)
+            return _dumps(value)
         elif value is None:
             return ""
         else:
@@ -125,16 +324,19 @@ class DataInserter:
     def clean_record_keys(self, record: Dict[str, Any]) -> Dict[str, Any]:
         """
         Remove leading and trailing spaces from the keys of a record.
+
+        Files read by load_json_file/iter_json_batches are already stripped at load time,
+        so for them this is only a scan over the keys.
         """
-        cleaned_record = {k.strip(): v for k, v in record.items()}
-        return cleaned_record
+        return strip_record_keys(record)
 
     def validate_table_name(self, table_name: str) -> bool:
         """
         Validate that the table name matches the expected pattern.
+
+        Configured tables are known to be valid, so only other names go through the regex.
         """
-        pattern = r'^[A-Za-z0-9_]+$'
-        if re.match(pattern, table_name):
+        if table_name in self.table_configs or _TABLE_NAME_RE.fullmatch(table_name):
             return True
         else:
             logger.error(
@@ -142,37 +344,57 @@ class DataInserter:
             )
             return False
 
-    def records_differ(self, existing_record: Dict[str, Any], new_record: Dict[str, Any],
-                       json_columns: List[str], excluded_columns: List[str]) -> bool:
+    @staticmethod
+    def build_getter(items: Tuple[Any, ...]) -> Callable[[Any], tuple]:
         """
-        Compare fields (excluding excluded_columns) between existing and new records to determine if they differ.
-        
-        For JSON columns, parse both existing and new values into Python objects and compare.
+        Build a function returning the given items (dict keys or row positions) as a tuple, using a C-level itemgetter.
         """
-        for column, new_value in new_record.items():
-            if column in excluded_columns:
-                continue
-            serialized_new_value = self.serialize_field(new_value)
-            existing_value = existing_record.get(column, "")
-
-            if column in json_columns:
-                # Normalize both sides to Python objects
-                parsed_existing = ensure_parsed_json(existing_value)
-                parsed_new = ensure_parsed_json(serialized_new_value)
-                if parsed_existing != parsed_new:
-                    logger.debug(
-                        f"Difference found in JSON column '{column}': existing='{parsed_existing}' vs new='{parsed_new}'"
-                    )
-                    return True
-            else:
-                # Normal column comparison
-                if existing_value != serialized_new_value:
-                    logger.debug(
-                        f"Difference found in column '{column}': existing='{existing_value}' vs new='{serialized_new_value}'"
-                    )
-                    return True
+        if not items:
+            return lambda row: ()
+        getter = operator.itemgetter(*items)
+        if len(items) == 1:
+            return lambda row: (getter(row),)
+        return getter
+
+    def records_differ(self, existing_row: tuple, col_idx: Dict[str, int], serialized: Dict[str, str],
+                       parsed_new: Dict[str, Any], parsed_existing: Dict[str, Any],
+                       scalar_getters: Tuple[Callable[[tuple], tuple], Callable[[Dict[str, str]], tuple]]) -> bool:
+        """
+        Compare fields between existing and new records to determine if they differ.
+
+        Takes the record's already serialized scalar values (excluded columns left out)
+        and, for JSON columns, both sides already parsed into Python objects, so the
+        comparison does no serialization or parsing of its own. The decision itself is
+        two comparisons that run in C: the layout's scalar columns pulled from the row
+        and the record with scalar_getters, then the parsed JSON dicts. The per-column loops below only
+        run to name the differing column when DEBUG logging is enabled.
+        """
+        # Cheap scalar comparison first, so a changed scalar column never waits on JSON comparisons
+        row_scalars, record_scalars = scalar_getters
+        if row_scalars(existing_row) == record_scalars(serialized) and parsed_existing == parsed_new:
+            return False
+        if not logger.isEnabledFor(logging.DEBUG):
+            return True
 
-        return False
+        for column, serialized_new_value in serialized.items():
+            existing_value = existing_row[col_idx[column]] if column in col_idx else ""
+            if existing_value != serialized_new_value:
+                logger.debug(
+                    "Difference found in column '%s': existing='%s' vs new='%s'",
+                    column, existing_value, serialized_new_value
+                )
+                return True
+
+        # Both sides of each JSON column were normalized to Python objects up front
+        for column, parsed_new_value in parsed_new.items():
+            if parsed_existing[column] != parsed_new_value:
+                logger.debug(
+                    "Difference found in JSON column '%s': existing='%s' vs new='%s'",
+                    column, parsed_existing[column], parsed_new_value
+                )
+                return True
+
+        return True
 
     def insert_or_update_record(self, table_name: str, record: Dict[str, Any]):
         """
@@ -183,156 +405,384 @@ class DataInserter:
             logger.error(f"Table name '{table_name}' is invalid. Skipping record.")
             return
 
-        # Clean the record keys
-        cleaned_record = self.clean_record_keys(record)
-        logger.debug(f"Cleaned record keys for table '{table_name}': {list(cleaned_record.keys())}")
-
-        # Increment counters
-        self.total_records += 1
-        self.table_stats[table_name]["total"] += 1
-
+        # Unconfigured tables have no statistics to count into, so they are turned away first
         config = self.table_configs.get(table_name)
         if not config:
             logger.warning(f"No configuration found for table '{table_name}'. Skipping record.")
-            self.total_skips += 1
-            self.table_stats[table_name]["skips"] += 1
             return
 
-        unique_keys = config["unique_keys"]
-        excluded_columns = config["excluded_columns"]
-        json_columns = config.get("json_columns", [])
+        # Clean the record keys
+        cleaned_record = self.clean_record_keys(record)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Cleaned record keys for table '%s': %s", table_name, list(cleaned_record.keys()))
+
+        # Increment counters
+        stats = self.table_stats[table_name]
+        stats["total"] += 1
+
+        unique_keys = config["unique_keys_tuple"]
+        excluded_columns = config["excluded_set"]
+        json_columns = config["json_set"]
 
-        # Extract unique key values
+        # Extract unique key values, in unique_keys order, as the WHERE clause binds them
         try:
-            unique_values = {key: cleaned_record[key] for key in unique_keys}
-            logger.debug(f"Unique keys for table '{table_name}': {unique_values}")
+            unique_values = config["unique_getter"](cleaned_record)
+            logger.debug("Unique keys %s for table '%s': %s", unique_keys, table_name, unique_values)
         except KeyError as ke:
             logger.error(f"Missing unique key '{ke.args[0]}' for table '{table_name}'. Record: {record}. Counting as failure.")
-            self.total_failures += 1
-            self.table_stats[table_name]["failures"] += 1
+            stats["failures"] += 1
+            return
+
+        # One UPSERT round-trip; RETURNING tells an insert from an update, and nothing comes
+        # back when the stored row was already identical
+        if config["upsert"]:
+            columns, values = self.row_values(table_name, cleaned_record)
+            connection = self.db.cursor.connection
+            try:
+                returned = execute_values(self.db.cursor, self.upsert_statement(table_name, columns), [values], fetch=True)
+                connection.commit()
+            except Exception as e:
+                connection.rollback()
+                logger.error(f"Error upserting record into '{table_name}': {e}")
+                stats["failures"] += 1
+                return
+
+            if not returned:
+                logger.info(f"No changes detected for record in '{table_name}': {unique_values}. Skipping update.")
+                stats["skips"] += 1
+            elif returned[0][0]:
+                logger.info(f"Inserted new record into '{table_name}': {unique_values}")
+                stats["insertions"] += 1
+            else:
+                logger.info(f"Updated record in '{table_name}': {unique_values}")
+                stats["updates"] += 1
             return
 
-        # Construct WHERE clause for unique keys
-        where_clause = " AND ".join([f"{key} = %s" for key in unique_keys])
-        where_values = tuple(unique_values[key] for key in unique_keys)
+        # Serialize every written scalar value once, and parse the JSON columns once;
+        # records_differ and the UPDATE below both read from these. Dicts and lists are
+        # compared as they are, instead of being dumped to JSON and parsed straight back,
+        # and JSON columns are only serialized when they are actually written.
+        serialized = {}
+        parsed_new = {}
+        for column, value in cleaned_record.items():
+            if column in excluded_columns:
+                continue
+            if column in json_columns:
+                parsed_new[column] = (
+                    value if isinstance(value, (dict, list)) else ensure_parsed_json(self.serialize_field(value))
+                )
+            else:
+                serialized[column] = self.serialize_field(value)
 
-        # Determine which columns to select explicitly
-        all_columns = [col for col in cleaned_record.keys() if col not in excluded_columns]
-        select_columns = list(set(all_columns + unique_keys))
+        # Statements run on the persistent insightsdb cursor
+        cursor = self.db.cursor
+        connection = cursor.connection
 
-        # Perform SELECT with explicit columns
-        select_query = f"SELECT {', '.join(select_columns)} FROM {table_name} WHERE {where_clause} LIMIT 1;"
         try:
-            logger.debug(f"Executing SELECT query: {select_query} with values {where_values}")
-            result = self.db._fetch_all(select_query, where_values)
-            logger.info(f"SELECT query executed successfully. Result: {result}")
+            # The prepared SELECT and INSERT, the selected columns' positions in the result row
+            # and the compared scalar columns only depend on the record's key layout, so they
+            # are built once per layout; dict.fromkeys dedupes the unique keys while keeping
+            # column order
+            layout = tuple(cleaned_record)
+            layout_entry = config["layouts"].get(layout)
+            if layout_entry is None:
+                written_columns = [col for col in layout if col not in excluded_columns]
+                select_columns = list(dict.fromkeys([*written_columns, *unique_keys]))
+                col_idx = {column: index for index, column in enumerate(select_columns)}
+                scalar_columns = tuple(col for col in written_columns if col not in json_columns)
+                select_query, insert_query = self.prepare(table_name, [
+                    (
+                        f"{table_name}_select",
+                        f"SELECT {', '.join(select_columns)} FROM {table_name} "
+                        f"WHERE {self.numbered_where(unique_keys, 1)} LIMIT 1",
+                        len(unique_keys),
+                    ),
+                    (
+                        f"{table_name}_insert",
+                        f"INSERT INTO {table_name} ({', '.join(written_columns)}) "
+                        f"VALUES ({', '.join(f'${position}' for position in range(1, len(written_columns) + 1))})",
+                        len(written_columns),
+                    ),
+                ])
+                layout_entry = config["layouts"][layout] = (
+                    select_query,
+                    insert_query,
+                    col_idx,
+                    (self.build_getter(tuple(col_idx[col] for col in scalar_columns)), self.build_getter(scalar_columns)),
+                )
+            select_query, insert_query, col_idx, scalar_getters = layout_entry
+
+            # Perform SELECT with explicit columns
+            logger.debug("Executing SELECT query: %s with values %s", select_query, unique_values)
+            cursor.execute(select_query, unique_values)
+            result = cursor.fetchall()
+            # The result can hold whole JSON documents; only format it when INFO is actually emitted
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("SELECT query executed successfully. Result: %s", result)
         except Exception as e:
+            connection.rollback()
             logger.error(f"Error executing SELECT for table '{table_name}': {e}")
-            self.total_failures += 1
-            self.table_stats[table_name]["failures"] += 1
+            stats["failures"] += 1
             return
 
         if result:
             # Existing record found
-            existing_record = dict(zip(select_columns, result[0]))
-            logger.debug(f"Existing record found in '{table_name}': {existing_record}")
+            # The row is indexed by position through col_idx rather than zipped into a dict
+            existing_row = result[0]
+            logger.debug("Existing record found in '%s': %s", table_name, existing_row)
+
+            parsed_existing = {
+                column: ensure_parsed_json(existing_row[col_idx[column]] if column in col_idx else "")
+                for column in parsed_new
+            }
 
             # Check if fields differ
-            if self.records_differ(existing_record, cleaned_record, json_columns, excluded_columns):
+            if self.records_differ(existing_row, col_idx, serialized, parsed_new, parsed_existing, scalar_getters):
                 # Prepare fields for update
-                update_fields = []
+                update_columns = []
                 update_values = []
                 for column, value in cleaned_record.items():
-                    if column in excluded_columns:
-                        continue
-                    serialized_value = self.serialize_field(value)
-                    existing_serialized = existing_record.get(column, "")
-
-                    if column in json_columns:
-                        parsed_existing = ensure_parsed_json(existing_serialized)
-                        parsed_new = ensure_parsed_json(serialized_value)
-                        if parsed_existing != parsed_new:
+                    if column in parsed_new:
+                        if parsed_existing[column] != parsed_new[column]:
                             logger.info(
-                                f"Updating JSON column '{column}' in '{table_name}': from '{parsed_existing}' to '{parsed_new}'"
+                                "Updating JSON column '%s' in '%s': from '%s' to '%s'",
+                                column, table_name, parsed_existing[column], parsed_new[column]
                             )
-                            update_fields.append(f"{column} = %s")
-                            update_values.append(serialized_value)
-                    else:
+                            update_columns.append(column)
+                            update_values.append(self.serialize_field(value))
+                    elif column in serialized:
+                        serialized_value = serialized[column]
+                        existing_serialized = existing_row[col_idx[column]] if column in col_idx else ""
                         if existing_serialized != serialized_value:
                             logger.info(
-                                f"Updating column '{column}' in '{table_name}': from '{existing_serialized}' to '{serialized_value}'"
+                                "Updating column '%s' in '%s': from '%s' to '%s'",
+                                column, table_name, existing_serialized, serialized_value
                             )
-                            update_fields.append(f"{column} = %s")
+                            update_columns.append(column)
                             update_values.append(serialized_value)
 
-                if update_fields:
-                    update_values.extend([unique_values[key] for key in unique_keys])
-                    update_query = f"UPDATE {table_name} SET {', '.join(update_fields)} WHERE {where_clause};"
+                if update_columns:
+                    update_values.extend(unique_values)
+                    update_columns = tuple(update_columns)
                     try:
-                        logger.debug(f"Executing UPDATE query: {update_query} with values {update_values}")
-                        self.db._execute(update_query, tuple(update_values))
+                        update_query = config["updates"].get(update_columns)
+                        if update_query is None:
+                            assignments = ", ".join(
+                                f"{column} = ${position}" for position, column in enumerate(update_columns, 1)
+                            )
+                            update_query = config["updates"][update_columns] = self.prepare(table_name, [(
+                                f"{table_name}_update",
+                                f"UPDATE {table_name} SET {assignments} "
+                                f"WHERE {self.numbered_where(unique_keys, len(update_columns) + 1)}",
+                                len(update_values),
+                            )])[0]
+                        logger.debug("Executing UPDATE query: %s with values %s", update_query, update_values)
+                        cursor.execute(update_query, tuple(update_values))
+                        connection.commit()
                         logger.info(f"Updated record in '{table_name}': {unique_values}")
-                        self.total_updates += 1
-                        self.table_stats[table_name]["updates"] += 1
+                        stats["updates"] += 1
                     except Exception as e:
+                        connection.rollback()
                         logger.error(f"Error updating record in '{table_name}': {e}")
-                        self.total_failures += 1
-                        self.table_stats[table_name]["failures"] += 1
+                        stats["failures"] += 1
                 else:
                     logger.info(f"No changes detected for record in '{table_name}': {unique_values}. Skipping update.")
-                    self.total_skips += 1
-                    self.table_stats[table_name]["skips"] += 1
+                    stats["skips"] += 1
             else:
                 # No differences
                 logger.info(f"No changes detected for record in '{table_name}': {unique_values}. Skipping update.")
-                self.total_skips += 1
-                self.table_stats[table_name]["skips"] += 1
+                stats["skips"] += 1
         else:
-            # No existing record, perform insertion
-            insert_fields = []
-            insert_placeholders = []
+            # No existing record, perform insertion with the layout's prepared INSERT
             insert_values = []
             for column, value in cleaned_record.items():
                 if column in excluded_columns:
                     continue
-                insert_fields.append(column)
-                insert_placeholders.append("%s")
-                if column in json_columns:
-                    serialized = self.serialize_field(value)
-                    insert_values.append(serialized)
+                if column in parsed_new:
+                    insert_values.append(self.serialize_field(value))
                 else:
                     insert_values.append(value)
 
-            insert_query = f"INSERT INTO {table_name} ({', '.join(insert_fields)}) VALUES ({', '.join(insert_placeholders)});"
             try:
-                logger.debug(f"Executing INSERT query: {insert_query} with values {insert_values}")
-                self.db._execute(insert_query, tuple(insert_values))
+                logger.debug("Executing INSERT query: %s with values %s", insert_query, insert_values)
+                cursor.execute(insert_query, tuple(insert_values))
+                connection.commit()
                 logger.info(f"Inserted new record into '{table_name}': {unique_values}")
-                self.total_insertions += 1
-                self.table_stats[table_name]["insertions"] += 1
+                stats["insertions"] += 1
             except Exception as e:
+                connection.rollback()
                 logger.error(f"Error inserting record into '{table_name}': {e}")
-                self.total_failures += 1
-                self.table_stats[table_name]["failures"] += 1
+                stats["failures"] += 1
+
+    def row_values(self, table_name: str, cleaned_record: Dict[str, Any]) -> Tuple[Tuple[str, ...], tuple]:
+        """
+        Return the columns an UPSERT writes for a record and their bind values, JSON columns serialized.
+        """
+        config = self.table_configs[table_name]
+        excluded_columns = config["excluded_set"]
+        json_columns = config["json_set"]
+        serialize = self.serialize_bind_value
+        columns = tuple(column for column in cleaned_record if column not in excluded_columns)
+        values = tuple(
+            serialize(cleaned_record[column]) if column in json_columns else cleaned_record[column]
+            for column in columns
+        )
+        return columns, values
+
+    def serialize_bind_value(self, value: Any) -> Any:
+        """
+        Serialize a JSON column's value for binding into a write.
+
+        Dicts and lists are bound straight from orjson's bytes when the connection
+        allows it; everything else is serialized exactly like serialize_field.
+        """
+        if self.json_bytes and isinstance(value, (dict, list)):
+            return JsonLiteral(_dumps_bytes(value))
+        return self.serialize_field(value)
+
+    def upsert_statement(self, table_name: str, columns: Tuple[str, ...]) -> str:
+        """
+        Return the cached multi-row UPSERT for a table and column order, for use with execute_values.
+
+        Conflicting rows are only rewritten when a written column actually changed, and each
+        inserted or updated row is returned with a flag telling which of the two happened.
+        """
+        config = self.table_configs[table_name]
+        statements = config["upsert_statements"]
+        query = statements.get(columns)
+        if query is not None:
+            return query
+
+        unique_keys = config["unique_keys_tuple"]
+        update_columns = [column for column in columns if column not in unique_keys]
+        conflict_action = "DO NOTHING"
+        if update_columns:
+            assignments = ", ".join(f"{column} = EXCLUDED.{column}" for column in update_columns)
+            # The json type has no equality operator, so JSON columns are compared as text
+            # (jsonb's text form is canonical, and text columns are unchanged by the cast)
+            json_columns = config["json_set"]
+            compared = [f"{column}::text" if column in json_columns else column for column in update_columns]
+            existing_values = ", ".join(f"{table_name}.{column}" for column in compared)
+            new_values = ", ".join(f"EXCLUDED.{column}" for column in compared)
+            conflict_action = (
+                f"DO UPDATE SET {assignments} WHERE ({existing_values}) IS DISTINCT FROM ({new_values})"
+            )
+        query = statements[columns] = (
+            f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES %s "
+            f"ON CONFLICT ({', '.join(unique_keys)}) {conflict_action} RETURNING (xmax = 0) AS inserted;"
+        )
+        return query
+
+    def insert_many(self, table_name: str, records: List[Dict[str, Any]]):
+        """
+        Insert or update a table's records with batched UPSERTs instead of a SELECT and a write per record.
+
+        Consecutive records with the same columns are sent together through execute_values,
+        UPSERT_PAGE_SIZE rows per statement, and the whole table is committed once. Tables
+        without a unique index on their unique keys (or runs without psycopg2) go through
+        insert_or_update_record one record at a time.
+        """
+        if not self.validate_table_name(table_name):
+            logger.error(f"Table name '{table_name}' is invalid. Skipping {len(records)} records.")
+            return
+
+        config = self.table_configs.get(table_name)
+        if not config:
+            logger.warning(f"No configuration found for table '{table_name}'. Skipping {len(records)} records.")
+            return
+
+        if not config["upsert"]:
+            for record in records:
+                self.insert_or_update_record(table_name, record)
+            return
+
+        unique_keys = config["unique_keys_tuple"]
+        stats = self.table_stats[table_name]
+
+        # A key repeated within a run starts a new one, since one UPSERT cannot affect a row twice
+        runs: List[Tuple[Tuple[str, ...], List[tuple]]] = []
+        run_keys = set()
+        for record in records:
+            cleaned_record = self.clean_record_keys(record)
+            stats["total"] += 1
+
+            try:
+                key = tuple(cleaned_record[unique_key] for unique_key in unique_keys)
+                # The key goes into run_keys below, so a list or dict value is rejected here
+                hash(key)
+            except KeyError as ke:
+                logger.error(f"Missing unique key '{ke.args[0]}' for table '{table_name}'. Record: {record}. Counting as failure.")
+                stats["failures"] += 1
+                continue
+            except TypeError:
+                logger.error(f"Unhashable unique key values for table '{table_name}'. Record: {record}. Counting as failure.")
+                stats["failures"] += 1
+                continue
+
+            columns, values = self.row_values(table_name, cleaned_record)
+            if not runs or runs[-1][0] != columns or key in run_keys:
+                runs.append((columns, []))
+                run_keys = set()
+            runs[-1][1].append(values)
+            run_keys.add(key)
+
+        batch_size = sum(len(rows) for _, rows in runs)
+        inserted = written = 0
+        connection = self.db.cursor.connection
+        try:
+            for columns, rows in runs:
+                returned = execute_values(
+                    self.db.cursor, self.upsert_statement(table_name, columns), rows,
+                    page_size=UPSERT_PAGE_SIZE, fetch=True
+                )
+                written += len(returned)
+                inserted += sum(1 for (was_inserted,) in returned if was_inserted)
+            connection.commit()
+        except Exception as e:
+            connection.rollback()
+            logger.error(f"Error upserting records into '{table_name}': {e}. Counting {batch_size} records as failures.")
+            stats["failures"] += batch_size
+            return
+
+        updated = written - inserted
+        skipped = batch_size - written
+        stats["insertions"] += inserted
+        stats["updates"] += updated
+        stats["skips"] += skipped
+        logger.info(f"Upserted records into '{table_name}': {inserted} inserted, {updated} updated, {skipped} unchanged.")
 
     def insert_data(self, data: Dict[str, List[Dict[str, Any]]]):
         """
-        Insert or update records into their respective tables.
+        Insert or update records into their respective tables, one batched UPSERT pass per table.
         """
+        # Drop non-list data, unconfigured tables and empty lists once, before any per-record work
+        tables = {}
         for table_name, records in data.items():
             if not isinstance(records, list):
                 logger.warning(f"Data for table '{table_name}' is not a list. Skipping.")
-                continue
+            elif table_name not in self.table_configs:
+                logger.warning(f"No configuration found for table '{table_name}'. Skipping {len(records)} records.")
+            elif records:
+                tables[table_name] = records
 
+        for table_name, records in tables.items():
             logger.info(f"Processing {len(records)} records for table '{table_name}'.")
+            batch = []
             for record in records:
                 if not isinstance(record, dict):
                     logger.warning(f"Record in table '{table_name}' is not a dictionary. Skipping.")
                     continue
+                batch.append(record)
 
-                self.insert_or_update_record(table_name, record)
+            self.insert_many(table_name, batch)
 
         # After processing all records, log the overall and table-specific statistics
+        self.log_statistics()
+
+    def log_statistics(self):
+        """
+        Log the overall and table-specific insertion statistics.
+        """
         logger.info("----- Data Insertion Statistics -----")
         logger.info(f"Total Records Processed: {self.total_records}")
         logger.info(f"Total Insertions: {self.total_insertions}")
@@ -367,11 +817,23 @@ def load_json_file(file_path: str) -> Dict[str, Any]:
         return {}
 
     try:
-        with open(file_path, "r") as f:
-            data = json.load(f)
+        # Read raw bytes so the parser works on the UTF-8 directly, without decoding to str first
+        with open(file_path, "rb") as f:
+            raw = f.read()
+        if simdjson is not None:
+            # recursive=True builds plain Python objects instead of lazy proxies
+            data = simdjson.Parser().parse(raw, True)
+        else:
+            data = _loads(raw)
+        # Strip record keys once here rather than rebuilding every record while inserting
+        if isinstance(data, dict):
+            for records in data.values():
+                if isinstance(records, list):
+                    records[:] = [strip_record_keys(r) if isinstance(r, dict) else r for r in records]
         logger.info(f"Successfully loaded data from '{file_path}'.")
         return data
-    except json.JSONDecodeError as e:
+    except ValueError as e:
+        # json/orjson raise JSONDecodeError and simdjson raises ValueError, both ValueError subclasses
         logger.error(f"Error decoding JSON from file '{file_path}': {e}")
     except Exception as e:
         logger.error(f"Unexpected error reading file '{file_path}': {e}")
@@ -379,11 +841,49 @@ def load_json_file(file_path: str) -> Dict[str, Any]:
     return {}
 
 
+def iter_json_batches(file_path: str, table_names: List[str],
+                      batch_size: int = STREAM_BATCH_SIZE) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """
+    Stream a table's records from a JSON file in batches, without loading the whole document.
+
+    Requires ijson (which picks its fastest available backend, yajl2_c when built). The file
+    is scanned once per table, so at most one batch of records is held in memory at a time.
+    """
+    for table_name in table_names:
+        with open(file_path, "rb") as f:
+            batch = []
+            # use_float keeps numbers as float rather than Decimal, which orjson cannot serialize
+            for record in ijson.items(f, f"{table_name}.item", use_float=True):
+                if not isinstance(record, dict):
+                    logger.warning(f"Record in table '{table_name}' is not a dictionary. Skipping.")
+                    continue
+                batch.append(strip_record_keys(record))
+                if len(batch) >= batch_size:
+                    yield table_name, batch
+                    batch = []
+            if batch:
+                yield table_name, batch
+
+
 def main():
     # Define the fixed path to perf_data.json relative to the script's directory
     script_dir = os.path.dirname(os.path.abspath(__file__))
     json_file_path = os.path.join(script_dir, "perf_data.json")
 
+    # Stream very large inputs batch by batch instead of parsing them into memory at once
+    if (ijson is not None and os.path.isfile(json_file_path)
+            and os.path.getsize(json_file_path) > STREAMING_THRESHOLD_BYTES):
+        inserter = DataInserter()
+        logger.info("Streaming data from perf_data.json:")
+        try:
+            for table_name, batch in iter_json_batches(json_file_path, list(inserter.table_configs)):
+                inserter.insert_many(table_name, batch)
+        except ijson.JSONError as e:
+            logger.error(f"Error decoding JSON from file '{json_file_path}': {e}")
+        inserter.log_statistics()
+        inserter.close()
+        return
+
     # Load data from the specified JSON file
     data = load_json_file(json_file_path)
     if not data:
@@ -2,10 +2,13 @@
 
 import sys
 import os
+import hashlib
+import io
 import json
 import logging
 import re
-from typing import Any, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
 
 # Add project root to sys.path
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -22,15 +25,209 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Prefer orjson for serializing and parsing JSON, falling back to the standard library with the same
+# compact separators and unescaped UTF-8. The two still differ on exponent floats (1e20 vs 1e+20) and
+# NaN (null vs NaN), so documents holding those count as changed once when the serializer changes.
+# Values orjson rejects, such as integers wider than 64 bits, are written by the standard library.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either the same way.
+try:
+    import orjson
+
+    def _dumps(value: Any) -> str:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(value: Any) -> str:
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+    _loads = json.loads
+
+# Optional incremental parser for input files too large to load at once
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Batched UPSERTs go through psycopg2's execute_values; without it every record takes the SELECT path
+try:
+    from psycopg2.extras import execute_values
+except ImportError:
+    execute_values = None
+
+# Rows sent per multi-row INSERT ... VALUES statement
+UPSERT_PAGE_SIZE = 500
+
+# Input files above this size are streamed with ijson (when installed) instead of loaded whole
+STREAMING_THRESHOLD_BYTES = 256 * 1024 * 1024
+
+# Records per insert_many call when streaming
+STREAM_BATCH_SIZE = 1000
+
+# Tables processed concurrently by insert_data, each on its own connection
+MAX_TABLE_WORKERS = 4
+
+# Table names are interpolated into SQL, so only alphanumerics and underscores are accepted
+_TABLE_NAME_RE = re.compile(r"[A-Za-z0-9_]+")
+
+# Queued SELECT-path writes sent together in one round trip by WritePipeline
+PIPELINE_SYNC_SIZE = 100
+
+# Characters escaped in the fields of COPY's text format
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _digest(text: str) -> str:
+    """
+    Hash a serialized value the way PostgreSQL's md5(text) does, as lowercase hex of its UTF-8 bytes.
+
+    :param text: The serialized value.
+    :return: The hex digest.
+    """
+    return hashlib.md5(text.encode(), usedforsecurity=False).hexdigest()
+
+
+def _rollback(db: insightsdb, table_name: str):
+    """
+    Roll back a failed statement's transaction, so later statements on the connection can still run.
+
+    :param db: Connection the statement failed on.
+    :param table_name: Name of the table, for log messages.
+    """
+    try:
+        db.cursor.connection.rollback()
+    except Exception as e:
+        logger.error(f"Error rolling back after a failed statement on '{table_name}': {e}")
+
+
+def _copy_field(value: Any) -> str:
+    """
+    Render a bound value as a field of COPY's text format, as the driver would have adapted it.
+
+    :param value: The value, already converted with serialize_for_db.
+    :return: The escaped field, or \\N for None.
+    :raises TypeError: If the value is not a string, number, boolean or None.
+    """
+    if value is None:
+        return "\\N"
+    if isinstance(value, str):
+        return value.translate(_COPY_ESCAPES)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    raise TypeError(f"Cannot COPY a value of type {type(value).__name__}")
+
+
+def _stats_total(key: str, doc: str) -> property:
+    """
+    Build a read-only property summing one statistic over every table in table_stats.
+
+    :param key: The statistic to sum.
+    :param doc: Docstring of the property.
+    :return: The property.
+    """
+    return property(lambda self: sum(stats[key] for stats in self.table_stats.values()), doc=doc)
+
+
+class WritePipeline:
+    """
+    Queue the INSERT and UPDATE statements of the SELECT-then-write path and send them together.
+
+    psycopg2 has no pipeline mode, so queued statements are rendered with mogrify and sent as
+    one multi-statement query, committed once: a round trip per sync instead of one per record.
+    If that fails, the batch is rolled back and replayed statement by statement, so a bad
+    record is still the only one counted as a failure.
+    """
+
+    # Success and failure messages by the statistic a write counts towards
+    messages = {
+        "insertions": ("Inserted new record into", "Error inserting record into"),
+        "updates": ("Updated record in", "Error updating record in"),
+    }
+
+    def __init__(self, db: insightsdb, table_name: str, stats: Dict[str, int], sync_size: int = PIPELINE_SYNC_SIZE):
+        """
+        :param db: Connection to write on.
+        :param table_name: Name of the table, for log messages.
+        :param stats: The table's statistics, counted into as writes complete.
+        :param sync_size: Number of queued statements that triggers a sync; 1 writes right away.
+        """
+        self.db = db
+        self.table_name = table_name
+        self.stats = stats
+        self.sync_size = sync_size
+        self.queued: List[Tuple[str, str, tuple, tuple]] = []
+
+    def write(self, outcome: str, query: str, params: tuple, where_values: tuple):
+        """
+        Queue a statement, sending the queue once it holds sync_size statements.
+
+        :param outcome: The statistic the write counts towards, "insertions" or "updates".
+        :param query: The statement.
+        :param params: Its parameters.
+        :param where_values: The record's unique key values, for log messages.
+        """
+        self.queued.append((outcome, query, params, where_values))
+        if len(self.queued) >= self.sync_size:
+            self.sync()
+
+    def sync(self):
+        """
+        Send every queued statement and count the results; must run before rows they write are read back.
+        """
+        queued, self.queued = self.queued, []
+        if len(queued) > 1:
+            cursor = self.db.cursor
+            try:
+                cursor.execute(b"\n".join(cursor.mogrify(query, params) for _, query, params, _ in queued))
+                cursor.connection.commit()
+            except Exception as e:
+                _rollback(self.db, self.table_name)
+                logger.warning(
+                    f"Error writing {len(queued)} queued records into '{self.table_name}': {e}. Retrying them one by one."
+                )
+            else:
+                for outcome, _, _, where_values in queued:
+                    logger.info(f"{self.messages[outcome][0]} '{self.table_name}': {where_values}")
+                    self.stats[outcome] += 1
+                return
+
+        for outcome, query, params, where_values in queued:
+            try:
+                self.db._execute(query, params)
+            except Exception as e:
+                _rollback(self.db, self.table_name)
+                logger.error(f"{self.messages[outcome][1]} '{self.table_name}': {e}")
+                self.stats["failures"] += 1
+                continue
+            logger.info(f"{self.messages[outcome][0]} '{self.table_name}': {where_values}")
+            self.stats[outcome] += 1
+
 
 class DataInserter:
     """
     Class responsible for inserting or updating data into the database using InsightsDB.
     """
 
-    def __init__(self):
+    # Overall counters are summed from table_stats, which only the thread working on a table
+    # writes to, so concurrent tables need no lock
+    total_records = _stats_total("total", "Total number of records processed.")
+    total_insertions = _stats_total("insertions", "Total number of records inserted.")
+    total_updates = _stats_total("updates", "Total number of records updated.")
+    total_skips = _stats_total("skips", "Total number of records skipped.")
+    total_failures = _stats_total("failures", "Total number of insert/update failures.")
+
+    def __init__(self, fast_mode: bool = True):
         """
         Initialize the DataInserter with an instance of InsightsDB.
+
+        :param fast_mode: Write with batched UPSERTs and let the database skip unchanged rows. When
+            False, every record is read back and compared with records_differ before it is written,
+            which logs each changed column.
         """
         # Initialize the database connection
         self.db = insightsdb()  # Ensure 'insightsdb' is correctly initialized
@@ -59,52 +256,157 @@ class DataInserter:
             }
         }
 
-        # Initialize overall counters
-        self.total_records = 0
-        self.total_insertions = 0
-        self.total_updates = 0
-        self.total_skips = 0  # Total number of records skipped
-        self.total_failures = 0  # Total number of insert/update failures
-
-        # Initialize table-specific statistics
+        # Initialize table-specific statistics; the overall totals are summed from these
         self.table_stats = {
             table: {"total": 0, "insertions": 0, "updates": 0, "skips": 0, "failures": 0}
             for table in self.table_configs.keys()
         }
 
+        for table_name, config in self.table_configs.items():
+            # Invariant SQL pieces and membership sets, built once instead of for every record
+            config["where_clause"] = " AND ".join(f"{key} = %s" for key in config["unique_keys"])
+            config["unique_set"] = frozenset(config["unique_keys"])
+            config["excluded_set"] = frozenset(config["excluded_columns"])
+            config["json_set"] = frozenset(config.get("json_columns", []))
+            # Column order and SELECT/INSERT statements by the record's key set, UPDATE statements
+            # by updated columns and UPSERT statements by written column order; built on first use
+            config["layouts"] = {}
+            config["updates"] = {}
+            config["upsert_statements"] = {}
+            # ON CONFLICT needs a unique index on exactly the unique keys; tables without one,
+            # and every table outside fast mode, keep the SELECT-then-write path
+            config["upsert"] = (
+                fast_mode and execute_values is not None and self.has_unique_index(table_name, config["unique_keys"])
+            )
+            # Batches of records that are all new are loaded with COPY, outside fast mode they are inserted one by one
+            config["copy"] = fast_mode
+            # JSON documents stored as text are read back on the SELECT path as md5 digests, not in full
+            config["hashed_columns"] = (
+                frozenset() if config["upsert"] else self.text_columns(table_name, config["json_set"])
+            )
+
+    def text_columns(self, table_name: str, columns: FrozenSet[str]) -> FrozenSet[str]:
+        """
+        Find which of the given columns are declared as text or varchar.
+
+        Only those hold exactly the text serialize_field wrote, so only their digests can be
+        compared; JSONB, for one, is rendered back in its own canonical form.
+
+        :param table_name: Name of the table.
+        :param columns: The candidate columns.
+        :return: Frozenset of the text-typed columns, empty if the catalog could not be read.
+        """
+        if not columns:
+            return frozenset()
+        query = (
+            "SELECT a.attname::text FROM pg_attribute a "
+            "WHERE a.attrelid = to_regclass(%s) AND a.attname = ANY(%s::text[]) AND NOT a.attisdropped "
+            "AND a.atttypid IN ('text'::regtype, 'varchar'::regtype);"
+        )
+        try:
+            return frozenset(column for (column,) in self.db._fetch_all(query, (table_name, sorted(columns))))
+        except Exception as e:
+            _rollback(self.db, table_name)
+            logger.warning(f"Could not inspect column types of '{table_name}': {e}")
+            return frozenset()
+
+    def select_expression(self, table_name: str, column: str, qualified: bool = False) -> str:
+        """
+        Return the SELECT expression for a column: its digest for text-stored JSON columns, else the column.
+
+        :param table_name: Name of the table.
+        :param column: The column.
+        :param qualified: Whether to qualify the column with the table name.
+        :return: The expression.
+        """
+        reference = f"{table_name}.{column}" if qualified else column
+        if column in self.table_configs[table_name]["hashed_columns"]:
+            # NULL digests like the empty string serialize_field gives None
+            return f"md5(coalesce({reference}, ''))"
+        return reference
+
+    def has_unique_index(self, table_name: str, unique_keys: List[str]) -> bool:
+        """
+        Check whether the table has a non-partial unique index covering exactly the unique keys.
+
+        :param table_name: Name of the table.
+        :param unique_keys: The columns that identify a record.
+        :return: True if such an index exists, False otherwise.
+        """
+        query = (
+            "SELECT 1 FROM pg_index i "
+            "WHERE i.indrelid = to_regclass(%s) AND i.indisunique AND i.indpred IS NULL "
+            "AND (SELECT array_agg(a.attname::text ORDER BY a.attname::text) FROM pg_attribute a "
+            "WHERE a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)) = %s::text[] LIMIT 1;"
+        )
+        try:
+            if self.db._fetch_all(query, (table_name, sorted(unique_keys))):
+                return True
+        except Exception as e:
+            _rollback(self.db, table_name)
+            logger.warning(f"Could not inspect indexes of '{table_name}': {e}")
+        logger.warning(
+            f"No unique index on {unique_keys} for table '{table_name}'. Falling back to SELECT before write."
+        )
+        return False
+
     def serialize_field(self, value: Any) -> str:
         """
         Serialize a field to JSON if it's a dict or list, else return as string.
 
+        This is the text form records are compared in; serialize_for_db gives the bound form.
+
         :param value: The value to serialize.
         :return: Serialized JSON string or string representation of the value.
         """
-        if isinstance(value, (dict, list)):
-            return json.dumps(value)
+        if isinstance(value, str):
+            return value
+        elif isinstance(value, (dict, list)):
+            return _dumps(value)
         elif value is None:
             return ""
         else:
             return str(value)
 
+    def serialize_for_db(self, value: Any, json_column: bool) -> Any:
+        """
+        Convert a field for binding in an INSERT or UPDATE.
+
+        JSON columns are stored as the text serialize_field produces, so they compare equal on the
+        next run. Other values are passed through, letting the driver adapt ints, floats, datetimes
+        and None natively instead of binding their str().
+
+        :param value: The value to convert.
+        :param json_column: Whether the value belongs to a JSON column.
+        :return: The value to bind.
+        """
+        return self.serialize_field(value) if json_column else value
+
     def clean_record_keys(self, record: Dict[str, Any]) -> Dict[str, Any]:
         """
         Remove leading and trailing spaces from the keys of a record.
 
+        Keys are nearly always clean already, in which case the record itself is returned
+        instead of a rebuilt copy.
+
         :param record: The original record with potential spaces in keys.
-        :return: A new record with cleaned keys.
+        :return: The record with cleaned keys.
         """
-        cleaned_record = {k.strip(): v for k, v in record.items()}
-        return cleaned_record
+        for key in record:
+            if key != key.strip():
+                return {k.strip(): v for k, v in record.items()}
+        return record
 
     def validate_table_name(self, table_name: str) -> bool:
         """
         Validate that the table name matches the expected pattern (no spaces, alphanumeric and underscores).
 
+        Configured tables are known to be valid, so only other names go through the regex.
+
         :param table_name: The table name to validate.
         :return: True if valid, False otherwise.
         """
-        pattern = r'^[A-Za-z0-9_]+$'
-        if re.match(pattern, table_name):
+        if table_name in self.table_configs or _TABLE_NAME_RE.fullmatch(table_name):
             return True
         else:
             logger.error(
@@ -112,42 +414,64 @@ class DataInserter:
             )
             return False
 
-    def records_differ(self, existing_record: Dict[str, Any], new_record: Dict[str, Any],
-                       json_columns: List[str], excluded_columns: List[str]) -> bool:
+    def records_differ(self, existing_record: Dict[str, Any], serialized_record: Dict[str, str],
+                       json_columns: FrozenSet[str]) -> bool:
         """
-        Compare fields (excluding excluded_columns) between existing and new records 
-        to determine if they differ.
+        Compare fields between existing and new records to determine if they differ.
         
-        For JSON columns, compare serialized JSON strings.
+        For JSON columns, compare the parsed documents when the driver returns them parsed, else the serialized JSON strings.
 
         :param existing_record: The existing record from the database as a dictionary.
-        :param new_record: The new record to compare.
-        :param json_columns: List of columns that contain JSON data.
-        :param excluded_columns: List of columns to exclude from comparison.
+        :param serialized_record: The new record's non-excluded columns, already serialized with serialize_field
+            (and digested with _digest where the existing record holds digests).
+        :param json_columns: Frozenset of columns that contain JSON data.
         :return: True if any non-excluded field differs, False otherwise.
         """
-        for column, new_value in new_record.items():
-            if column in excluded_columns:
-                continue
-            serialized_new_value = self.serialize_field(new_value)
-            existing_value = existing_record.get(column, "")
+        field_differs = self.field_differs
+        for column, serialized_new_value in serialized_record.items():
+            existing_value = existing_record.get(column)
 
             if column in json_columns:
-                if existing_value != serialized_new_value:
+                if field_differs(existing_value, serialized_new_value, True):
                     logger.debug(
-                        f"Difference found in JSON column '{column}': existing='{existing_value}' vs new='{serialized_new_value}'"
+                        "Difference found in JSON column '%s': existing='%s' vs new='%s'",
+                        column, existing_value, serialized_new_value
                     )
                     return True
             else:
-                if existing_value != serialized_new_value:
+                if field_differs(existing_value, serialized_new_value, False):
                     logger.debug(
-                        f"Difference found in column '{column}': existing='{existing_value}' vs new='{serialized_new_value}'"
+                        "Difference found in column '%s': existing='%s' vs new='%s'",
+                        column, existing_value, serialized_new_value
                     )
                     return True
 
         return False
 
-    def insert_or_update_record(self, table_name: str, record: Dict[str, Any]):
+    def field_differs(self, existing_value: Any, serialized_new_value: str, json_column: bool) -> bool:
+        """
+        Compare one fetched value with the new record's serialized value for the same column.
+
+        jsonb (and json) columns come back already parsed, with the keys in the database's own
+        order rather than the input's, so they are compared with the new value parsed back.
+        Everything else goes through serialize_field, so NULL and numbers compare equal to
+        the values that were written.
+
+        :param existing_value: The value fetched from the database.
+        :param serialized_new_value: The new value, serialized with serialize_field (or its digest).
+        :param json_column: Whether the column contains JSON data.
+        :return: True if the values differ, False otherwise.
+        """
+        if json_column and existing_value is not None and not isinstance(existing_value, str):
+            try:
+                return existing_value != _loads(serialized_new_value)
+            except ValueError:
+                return True
+        return self.serialize_field(existing_value) != serialized_new_value
+
+    def insert_or_update_record(self, table_name: str, record: Dict[str, Any],
+                                existing_records: Optional[Dict[tuple, Optional[Dict[str, Any]]]] = None,
+                                db: Optional[insightsdb] = None, pipeline: Optional[WritePipeline] = None):
         """
         Insert a new record or update an existing record in the specified table.
 
@@ -158,156 +482,534 @@ class DataInserter:
         If record does not exist:
             - Insert a new record.
 
+        On tables with a unique index, a record written on its own goes through insert_many as a
+        single UPSERT whose RETURNING flag tells an insert from an update, with no SELECT first.
+
         :param table_name: Name of the table.
         :param record: Dictionary containing column-value pairs.
+        :param existing_records: Rows already looked up by fetch_existing_records, by unique key values.
+            An entry is used once and then removed; records without one are looked up with a SELECT.
+        :param db: Connection to use instead of the inserter's own, e.g. from a worker thread.
+        :param pipeline: Queue for the record's INSERT or UPDATE; without one it is written right away.
         """
+        db = db or self.db
+
         # Validate table name
         if not self.validate_table_name(table_name):
             logger.error(f"Table name '{table_name}' is invalid. Skipping record.")
             return
 
+        config = self.table_configs.get(table_name)
+        if config and config["upsert"] and existing_records is None and pipeline is None:
+            self.insert_many(table_name, [record], db)
+            return
+
         # Clean the record keys to remove any leading/trailing spaces
         cleaned_record = self.clean_record_keys(record)
-        logger.debug(f"Cleaned record keys for table '{table_name}': {list(cleaned_record.keys())}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Cleaned record keys for table '%s': %s", table_name, list(cleaned_record.keys()))
 
         # Increment counters
-        self.total_records += 1
-        self.table_stats[table_name]["total"] += 1
+        stats = self.table_stats[table_name]
+        stats["total"] += 1
 
-        config = self.table_configs.get(table_name)
         if not config:
             logger.warning(f"No configuration found for table '{table_name}'. Skipping record.")
-            self.total_skips += 1
-            self.table_stats[table_name]["skips"] += 1
+            stats["skips"] += 1
             return
 
         unique_keys = config["unique_keys"]
-        excluded_columns = config["excluded_columns"]
-        json_columns = config.get("json_columns", [])
+        excluded_columns = config["excluded_set"]
+        json_columns = config["json_set"]
+        where_clause = config["where_clause"]
+        pipeline = pipeline or WritePipeline(db, table_name, stats, sync_size=1)
 
-        # Extract unique key values
+        # Extract unique key values, in unique_keys order, as the WHERE clause binds them
         try:
-            unique_values = {key: cleaned_record[key] for key in unique_keys}
-            logger.debug(f"Unique keys for table '{table_name}': {unique_values}")
+            where_values = tuple(cleaned_record[key] for key in unique_keys)
         except KeyError as ke:
             logger.error(f"Missing unique key '{ke.args[0]}' for table '{table_name}'. Record: {record}. Counting as failure.")
-            self.total_failures += 1
-            self.table_stats[table_name]["failures"] += 1
+            stats["failures"] += 1
             return
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Unique keys for table '%s': %s", table_name, dict(zip(unique_keys, where_values)))
 
-        # Construct WHERE clause for unique keys
-        where_clause = " AND ".join([f"{key} = %s" for key in unique_keys])
-        where_values = tuple(unique_values[key] for key in unique_keys)
+        # Columns and statements for this record's key set
+        layout = self.record_layout(table_name, cleaned_record)
+        select_columns = layout["select_columns"]
 
-        # Determine which columns to select explicitly
-        all_columns = [col for col in cleaned_record.keys() if col not in excluded_columns]
-        select_columns = list(set(all_columns + unique_keys))
-
-        # Perform SELECT with explicit columns
-        select_query = f"SELECT {', '.join(select_columns)} FROM {table_name} WHERE {where_clause} LIMIT 1;"
-        try:
-            logger.debug(f"Executing SELECT query: {select_query} with values {where_values}")
-            result = self.db._fetch_all(select_query, where_values)
-            logger.info(f"SELECT query executed successfully. Result: {result}")
-        except Exception as e:
-            logger.error(f"Error executing SELECT for table '{table_name}': {e}")
-            self.total_failures += 1
-            self.table_stats[table_name]["failures"] += 1
-            return
+        if existing_records is not None and where_values in existing_records:
+            # Already looked up in bulk; the entry goes stale once this record is written
+            existing_record = existing_records.pop(where_values)
+        else:
+            # Perform SELECT with explicit columns, after any queued write it should see
+            pipeline.sync()
+            select_query = layout["select_query"]
+            try:
+                logger.debug("Executing SELECT query: %s with values %s", select_query, where_values)
+                result = db._fetch_all(select_query, where_values)
+            except Exception as e:
+                _rollback(db, table_name)
+                logger.error(f"Error executing SELECT for table '{table_name}': {e}")
+                stats["failures"] += 1
+                return
+            existing_record = dict(zip(select_columns, result[0])) if result else None
 
-        if result:
+        if existing_record is not None:
             # Existing record found
-            existing_record = dict(zip(select_columns, result[0]))
-            logger.debug(f"Existing record found in '{table_name}': {existing_record}")
+            logger.debug("Existing record found in '%s': %s", table_name, existing_record)
+
+            # Serialize each non-excluded column once; the comparison and the update share it
+            serialize_field = self.serialize_field
+            serialized_record = {
+                column: serialize_field(value)
+                for column, value in cleaned_record.items()
+                if column not in excluded_columns
+            }
+
+            # Text-stored JSON columns were fetched as digests, so they are compared as digests
+            hashed_columns = config["hashed_columns"]
+            compared_record = serialized_record if not hashed_columns else {
+                column: _digest(value) if column in hashed_columns else value
+                for column, value in serialized_record.items()
+            }
 
             # Check if fields differ (excluding excluded_columns)
-            if self.records_differ(existing_record, cleaned_record, json_columns, excluded_columns):
+            if self.records_differ(existing_record, compared_record, json_columns):
                 # Prepare fields for update
-                update_fields = []
+                update_columns = []
                 update_values = []
-                for column, value in cleaned_record.items():
-                    if column in excluded_columns:
-                        continue  # Skip excluded columns
-                    serialized_value = self.serialize_field(value)
-                    existing_serialized = existing_record.get(column, "")
-                    if existing_serialized != serialized_value:
-                        logger.info(
-                            f"Updating column '{column}' in '{table_name}': from '{existing_serialized}' to '{serialized_value}'"
+                for column, compared_value in compared_record.items():
+                    existing_value = existing_record.get(column)
+                    if self.field_differs(existing_value, compared_value, column in json_columns):
+                        if column in hashed_columns:
+                            # Only the stored document's digest was fetched
+                            logger.info(
+                                "Updating column '%s' in '%s': from the document with md5 '%s' to '%s'",
+                                column, table_name, existing_value, serialized_record[column]
+                            )
+                        else:
+                            logger.info(
+                                "Updating column '%s' in '%s': from '%s' to '%s'",
+                                column, table_name, serialize_field(existing_value), serialized_record[column]
+                            )
+                        update_columns.append(column)
+                        # The serialized text is already the bound form for JSON columns
+                        update_values.append(
+                            serialized_record[column] if column in json_columns else cleaned_record[column]
+                        )
+
+                if update_columns:
+                    update_values.extend(where_values)
+                    update_columns = tuple(update_columns)
+                    update_query = config["updates"].get(update_columns)
+                    if update_query is None:
+                        assignments = ", ".join(f"{column} = %s" for column in update_columns)
+                        update_query = config["updates"][update_columns] = (
+                            f"UPDATE {table_name} SET {assignments} WHERE {where_clause};"
                         )
-                        update_fields.append(f"{column} = %s")
-                        update_values.append(serialized_value)
-
-                if update_fields:
-                    update_values.extend([unique_values[key] for key in unique_keys])
-                    update_query = f"UPDATE {table_name} SET {', '.join(update_fields)} WHERE {where_clause};"
-                    try:
-                        logger.debug(f"Executing UPDATE query: {update_query} with values {update_values}")
-                        self.db._execute(update_query, tuple(update_values))
-                        logger.info(f"Updated record in '{table_name}': {unique_values}")
-                        self.total_updates += 1
-                        self.table_stats[table_name]["updates"] += 1
-                    except Exception as e:
-                        logger.error(f"Error updating record in '{table_name}': {e}")
-                        self.total_failures += 1
-                        self.table_stats[table_name]["failures"] += 1
+                    logger.debug("Executing UPDATE query: %s with values %s", update_query, update_values)
+                    pipeline.write("updates", update_query, tuple(update_values), where_values)
                 else:
                     # No differences that require update
-                    logger.info(f"No changes detected for record in '{table_name}': {unique_values}. Skipping update.")
-                    self.total_skips += 1
-                    self.table_stats[table_name]["skips"] += 1
+                    logger.info(f"No changes detected for record in '{table_name}': {where_values}. Skipping update.")
+                    stats["skips"] += 1
             else:
                 # No differences
-                logger.info(f"No changes detected for record in '{table_name}': {unique_values}. Skipping update.")
-                self.total_skips += 1
-                self.table_stats[table_name]["skips"] += 1
+                logger.info(f"No changes detected for record in '{table_name}': {where_values}. Skipping update.")
+                stats["skips"] += 1
+        else:
+            # No existing record, perform insertion in the layout's column order
+            insert_values = [
+                self.serialize_for_db(cleaned_record[column], column in json_columns) for column in layout["columns"]
+            ]
+
+            insert_query = layout["insert_query"]
+            logger.debug("Executing INSERT query: %s with values %s", insert_query, insert_values)
+            pipeline.write("insertions", insert_query, tuple(insert_values), where_values)
+
+    def record_layout(self, table_name: str, cleaned_record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Return the written columns and SELECT/INSERT statements for a record's key set, building them on first use.
+
+        :param table_name: Name of the table.
+        :param cleaned_record: The record with cleaned keys.
+        :return: Dictionary with the written columns, the selected columns and both statements.
+        """
+        config = self.table_configs[table_name]
+        layouts = config["layouts"]
+        key_set = frozenset(cleaned_record)
+        layout = layouts.get(key_set)
+        if layout is None:
+            excluded_columns = config["excluded_set"]
+            columns = tuple(column for column in cleaned_record if column not in excluded_columns)
+            # The written columns in record order, then any unique key the record lacks
+            select_columns = columns + tuple(key for key in config["unique_keys"] if key not in columns)
+            layout = layouts[key_set] = {
+                "columns": columns,
+                "select_columns": select_columns,
+                "select_query": (
+                    f"SELECT {', '.join(self.select_expression(table_name, column) for column in select_columns)} "
+                    f"FROM {table_name} WHERE {config['where_clause']} LIMIT 1;"
+                ),
+                "insert_query": (
+                    f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))});"
+                ),
+            }
+        return layout
+
+    def fetch_existing_records(self, table_name: str, records: List[Dict[str, Any]],
+                               db: Optional[insightsdb] = None) -> Optional[Dict[tuple, Optional[Dict[str, Any]]]]:
+        """
+        Look up the stored rows for a batch of records in one SELECT per UPSERT_PAGE_SIZE keys.
+
+        Single-column keys are passed as one array, composite keys as a VALUES list. Each key
+        carries its position in the batch, and rows are matched back by that position rather
+        than by the values the database returns, which may come back as a different type.
+        Every key of the batch gets an entry, None when there is no stored row, so
+        insert_or_update_record can tell a missing row from one that was not looked up.
+
+        :param table_name: Name of the table.
+        :param records: List of dictionaries containing column-value pairs.
+        :param db: Connection to use instead of the inserter's own, e.g. from a worker thread.
+        :return: Existing records by unique key values, or None if they could not be fetched.
+        """
+        db = db or self.db
+        if execute_values is None:
+            return None
+
+        config = self.table_configs[table_name]
+        unique_keys = config["unique_keys"]
+        excluded_columns = config["excluded_set"]
+
+        # Select every written column of the batch plus the unique keys, in first-seen order
+        keys = {}
+        select_columns = {}
+        for record in records:
+            cleaned_record = self.clean_record_keys(record)
+            try:
+                key = tuple(cleaned_record[unique_key] for unique_key in unique_keys)
+                keys[key] = None
+            except KeyError:
+                continue  # Reported as a failure by insert_or_update_record
+            except TypeError:
+                logger.debug("Unhashable unique key values in '%s'. Selecting records one by one.", table_name)
+                return None
+            select_columns.update((column, None) for column in cleaned_record if column not in excluded_columns)
+        select_columns.update((unique_key, None) for unique_key in unique_keys)
+        select_columns = list(select_columns)
+        key_list = list(keys)
+
+        selected = ", ".join(self.select_expression(table_name, column, qualified=True) for column in select_columns)
+        key_columns = ", ".join(f"{table_name}.{unique_key}" for unique_key in unique_keys)
+        if len(unique_keys) == 1:
+            query = (
+                f"SELECT batch.position, {selected} FROM {table_name} "
+                f"JOIN unnest(%s) WITH ORDINALITY AS batch(key, position) ON {key_columns} = batch.key;"
+            )
         else:
-            # No existing record, perform insertion
-            insert_fields = []
-            insert_placeholders = []
-            insert_values = []
-            for column, value in cleaned_record.items():
-                if column in excluded_columns:
-                    continue  # Skip excluded columns
-                insert_fields.append(column)
-                insert_placeholders.append("%s")
-                if column in json_columns:
-                    serialized = self.serialize_field(value)
-                    insert_values.append(serialized)
+            batch_keys = [f"key{index}" for index in range(len(unique_keys))]
+            query = (
+                f"SELECT batch.position, {selected} FROM {table_name} "
+                f"JOIN (VALUES %s) AS batch(position, {', '.join(batch_keys)}) "
+                f"ON ({key_columns}) = ({', '.join(f'batch.{key}' for key in batch_keys)});"
+            )
+        try:
+            rows = []
+            for start in range(0, len(key_list), UPSERT_PAGE_SIZE):
+                page = key_list[start:start + UPSERT_PAGE_SIZE]
+                if len(unique_keys) == 1:
+                    # WITH ORDINALITY counts from 1
+                    found = db._fetch_all(query, ([key[0] for key in page],))
+                    rows.extend((start + position - 1, *values) for position, *values in found)
                 else:
-                    insert_values.append(value)
+                    page_rows = [(start + offset, *key) for offset, key in enumerate(page)]
+                    rows.extend(execute_values(db.cursor, query, page_rows, page_size=len(page), fetch=True))
+        except Exception as e:
+            _rollback(db, table_name)
+            logger.warning(f"Could not look up existing records in '{table_name}' in bulk: {e}. Selecting them one by one.")
+            return None
+
+        # Without a unique index a key can match several rows; like SELECT ... LIMIT 1, keep one of them
+        for position, *values in rows:
+            key = key_list[position]
+            if keys[key] is None:
+                keys[key] = dict(zip(select_columns, values))
+        if logger.isEnabledFor(logging.DEBUG):
+            found_count = sum(1 for row in keys.values() if row is not None)
+            logger.debug("Found %d of %d records in '%s'.", found_count, len(keys), table_name)
+        return keys
+
+    def copy_records(self, table_name: str, records: List[Dict[str, Any]], db: Optional[insightsdb] = None) -> bool:
+        """
+        Load a batch of records known to be new with COPY FROM STDIN instead of an INSERT per record.
+
+        Consecutive records with the same columns share a COPY, and the batch is committed once.
+        If any value cannot be rendered or the COPY fails, nothing is written and the caller
+        inserts the records one by one, so each failure is reported as it would be there.
+
+        :param table_name: Name of the table.
+        :param records: List of dictionaries containing column-value pairs, none of them stored yet.
+        :param db: Connection to use instead of the inserter's own, e.g. from a worker thread.
+        :return: True if the records were copied, False if they still need to be written.
+        """
+        db = db or self.db
+        json_columns = self.table_configs[table_name]["json_set"]
+        serialize_for_db = self.serialize_for_db
+
+        runs: List[Tuple[Tuple[str, ...], List[str]]] = []
+        run_columns = None
+        run_lines: List[str] = []
+        connection = db.cursor.connection
+        try:
+            for record in records:
+                cleaned_record = self.clean_record_keys(record)
+                columns = self.record_layout(table_name, cleaned_record)["columns"]
+                if columns != run_columns:
+                    run_columns = columns
+                    run_lines = []
+                    runs.append((columns, run_lines))
+                run_lines.append("\t".join(
+                    _copy_field(serialize_for_db(cleaned_record[column], column in json_columns)) for column in columns
+                ))
+            for columns, lines in runs:
+                lines.append("")
+                db.cursor.copy_expert(
+                    f"COPY {table_name} ({', '.join(columns)}) FROM STDIN", io.StringIO("\n".join(lines))
+                )
+            connection.commit()
+        except Exception as e:
+            connection.rollback()
+            logger.warning(f"Could not copy {len(records)} new records into '{table_name}': {e}. Inserting them one by one.")
+            return False
+
+        stats = self.table_stats[table_name]
+        stats["total"] += len(records)
+        stats["insertions"] += len(records)
+        logger.info(f"Copied {len(records)} new records into '{table_name}'.")
+        return True
+
+    def upsert_statement(self, table_name: str, columns: Tuple[str, ...]) -> str:
+        """
+        Return the multi-row UPSERT for a table and column order, for use with execute_values.
+
+        Conflicting rows are only rewritten when a written column actually changed, and each
+        inserted or updated row is returned with a flag telling which of the two happened.
+        The statement is generated once per column order and cached in the table's config.
+
+        :param table_name: Name of the table.
+        :param columns: The written columns, in the order of the VALUES rows.
+        :return: The UPSERT statement with a single %s placeholder for the VALUES list.
+        """
+        config = self.table_configs[table_name]
+        statement = config["upsert_statements"].get(columns)
+        if statement is not None:
+            return statement
+
+        unique_keys = config["unique_keys"]
+        unique_set = config["unique_set"]
+        update_columns = [column for column in columns if column not in unique_set]
+        conflict_action = "DO NOTHING"
+        if update_columns:
+            assignments = ", ".join(f"{column} = EXCLUDED.{column}" for column in update_columns)
+            # The json type has no equality operator, so JSON columns are compared as text
+            # (jsonb's text form is canonical, and text columns are unchanged by the cast)
+            json_columns = config["json_set"]
+            compared = [f"{column}::text" if column in json_columns else column for column in update_columns]
+            existing_values = ", ".join(f"{table_name}.{column}" for column in compared)
+            new_values = ", ".join(f"EXCLUDED.{column}" for column in compared)
+            conflict_action = (
+                f"DO UPDATE SET {assignments} WHERE ({existing_values}) IS DISTINCT FROM ({new_values})"
+            )
+        statement = config["upsert_statements"][columns] = (
+            f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES %s "
+            f"ON CONFLICT ({', '.join(unique_keys)}) {conflict_action} RETURNING (xmax = 0) AS inserted;"
+        )
+        return statement
+
+    def insert_many(self, table_name: str, records: List[Dict[str, Any]], db: Optional[insightsdb] = None):
+        """
+        Insert or update a table's records with batched UPSERTs instead of a SELECT and a write per record.
+
+        Consecutive records with the same columns are sent together through execute_values,
+        UPSERT_PAGE_SIZE rows per statement, and the whole table is committed once. The database
+        does the comparison with IS DISTINCT FROM, so records_differ is not needed here. Tables
+        without a unique index on their unique keys (or runs without psycopg2) go through
+        insert_or_update_record one record at a time.
+
+        :param table_name: Name of the table.
+        :param records: List of dictionaries containing column-value pairs.
+        :param db: Connection to use instead of the inserter's own, e.g. from a worker thread.
+        """
+        db = db or self.db
+        if not self.validate_table_name(table_name):
+            logger.error(f"Table name '{table_name}' is invalid. Skipping {len(records)} records.")
+            return
+
+        config = self.table_configs.get(table_name)
+        if not config:
+            logger.warning(f"No configuration found for table '{table_name}'. Skipping {len(records)} records.")
+            return
+
+        if not config["upsert"]:
+            existing_records = self.fetch_existing_records(table_name, records, db)
+            # One entry per record and no stored rows: every record is a distinct new row
+            if (
+                config["copy"] and existing_records is not None and len(existing_records) == len(records)
+                and not any(existing_records.values()) and self.copy_records(table_name, records, db)
+            ):
+                return
+            pipeline = WritePipeline(db, table_name, self.table_stats[table_name])
+            for record in records:
+                self.insert_or_update_record(table_name, record, existing_records, db, pipeline)
+            pipeline.sync()
+            return
+
+        # Everything the per-record loop touches is bound to a local once per table
+        unique_keys = config["unique_keys"]
+        excluded_columns = config["excluded_set"]
+        json_columns = config["json_set"]
+        stats = self.table_stats[table_name]
+        clean_record_keys = self.clean_record_keys
+        serialize_field = self.serialize_field
+        stats["total"] += len(records)
+
+        # A key repeated within a run starts a new one, since one UPSERT cannot affect a row twice
+        runs: List[Tuple[Tuple[str, ...], List[tuple]]] = []
+        run_columns = None
+        run_rows: List[tuple] = []
+        run_keys = set()
+        for record in records:
+            cleaned_record = clean_record_keys(record)
 
-            insert_query = f"INSERT INTO {table_name} ({', '.join(insert_fields)}) VALUES ({', '.join(insert_placeholders)});"
             try:
-                logger.debug(f"Executing INSERT query: {insert_query} with values {insert_values}")
-                self.db._execute(insert_query, tuple(insert_values))
-                logger.info(f"Inserted new record into '{table_name}': {unique_values}")
-                self.total_insertions += 1
-                self.table_stats[table_name]["insertions"] += 1
-            except Exception as e:
-                logger.error(f"Error inserting record into '{table_name}': {e}")
-                self.total_failures += 1
-                self.table_stats[table_name]["failures"] += 1
+                key = tuple(cleaned_record[unique_key] for unique_key in unique_keys)
+                # The key goes into run_keys below, so a list or dict value is rejected here
+                hash(key)
+            except KeyError as ke:
+                logger.error(f"Missing unique key '{ke.args[0]}' for table '{table_name}'. Record: {record}. Counting as failure.")
+                stats["failures"] += 1
+                continue
+            except TypeError:
+                logger.error(f"Unhashable unique key values for table '{table_name}'. Record: {record}. Counting as failure.")
+                stats["failures"] += 1
+                continue
+
+            # serialize_for_db, inlined: JSON columns are serialized, other values are bound as they are
+            columns = tuple(column for column in cleaned_record if column not in excluded_columns)
+            values = tuple(
+                serialize_field(cleaned_record[column]) if column in json_columns else cleaned_record[column]
+                for column in columns
+            )
+            if columns != run_columns or key in run_keys:
+                run_columns = columns
+                run_rows = []
+                run_keys = set()
+                runs.append((columns, run_rows))
+            run_rows.append(values)
+            run_keys.add(key)
+
+        batch_size = sum(len(rows) for _, rows in runs)
+        inserted = written = 0
+        connection = db.cursor.connection
+        try:
+            for columns, rows in runs:
+                returned = execute_values(
+                    db.cursor, self.upsert_statement(table_name, columns), rows,
+                    page_size=UPSERT_PAGE_SIZE, fetch=True
+                )
+                written += len(returned)
+                inserted += sum(1 for (was_inserted,) in returned if was_inserted)
+            connection.commit()
+        except Exception as e:
+            connection.rollback()
+            logger.error(f"Error upserting records into '{table_name}': {e}. Counting {batch_size} records as failures.")
+            stats["failures"] += batch_size
+            return
+
+        updated = written - inserted
+        skipped = batch_size - written
+        stats["insertions"] += inserted
+        stats["updates"] += updated
+        stats["skips"] += skipped
+        logger.info(f"Upserted records into '{table_name}': {inserted} inserted, {updated} updated, {skipped} unchanged.")
+
+    def _insert_table_batch(self, table_name: str, records: List[Dict[str, Any]]):
+        """
+        Run insert_many for one table on a dedicated connection (used by worker threads).
+
+        :param table_name: Name of the table.
+        :param records: List of dictionaries containing column-value pairs.
+        """
+        db = insightsdb()
+        try:
+            self.insert_many(table_name, records, db)
+        finally:
+            db.close()
 
     def insert_data(self, data: Dict[str, List[Dict[str, Any]]]):
         """
-        Insert or update records into their respective tables.
+        Insert or update records into their respective tables, one batched UPSERT pass per table.
+
+        Tables are independent, so each one is processed on its own thread and connection,
+        overlapping their database round trips.
 
         :param data: Dictionary containing table names as keys and lists of records as values.
         """
+        batches = []
         for table_name, records in data.items():
             if not isinstance(records, list):
                 logger.warning(f"Data for table '{table_name}' is not a list. Skipping.")
                 continue
 
             logger.info(f"Processing {len(records)} records for table '{table_name}'.")
+            batch = []
             for record in records:
                 if not isinstance(record, dict):
                     logger.warning(f"Record in table '{table_name}' is not a dictionary. Skipping.")
                     continue
+                batch.append(record)
 
-                self.insert_or_update_record(table_name, record)
+            batches.append((table_name, batch))
+
+        if batches:
+            with ThreadPoolExecutor(max_workers=min(MAX_TABLE_WORKERS, len(batches))) as executor:
+                futures = [executor.submit(self._insert_table_batch, table_name, batch) for table_name, batch in batches]
+                for future in futures:
+                    future.result()
 
         # After processing all records, log the overall and table-specific statistics
+        self.log_statistics()
+
+    def insert_records(self, records: Iterable[Tuple[str, Dict[str, Any]]],
+                       batch_size: int = STREAM_BATCH_SIZE):
+        """
+        Insert or update a stream of (table name, record) pairs, such as the one iter_records yields.
+
+        Consecutive records of the same table are collected into batches of at most batch_size
+        and written with insert_many, so only one batch is held in memory at a time.
+
+        :param records: Iterable of (table name, record) pairs.
+        :param batch_size: Maximum number of records per insert_many call.
+        """
+        batch_table = None
+        batch = []
+        for table_name, record in records:
+            if table_name != batch_table or len(batch) >= batch_size:
+                if batch:
+                    self.insert_many(batch_table, batch)
+                batch_table = table_name
+                batch = []
+            batch.append(record)
+        if batch:
+            self.insert_many(batch_table, batch)
+
+        self.log_statistics()
+
+    def log_statistics(self):
+        """
+        Log the overall and table-specific insertion statistics.
+        """
         logger.info("----- Data Insertion Statistics -----")
         logger.info(f"Total Records Processed: {self.total_records}")
         logger.info(f"Total Insertions: {self.total_insertions}")
@@ -345,8 +1047,9 @@ def load_json_file(file_path: str) -> Dict[str, Any]:
         return {}
 
     try:
-        with open(file_path, "r") as f:
-            data = json.load(f)
+        # Read raw bytes so orjson parses the UTF-8 directly, without decoding to str first
+        with open(file_path, "rb") as f:
+            data = _loads(f.read())
         logger.info(f"Successfully loaded data from '{file_path}'.")
         return data
     except json.JSONDecodeError as e:
@@ -357,11 +1060,45 @@ def load_json_file(file_path: str) -> Dict[str, Any]:
     return {}
 
 
+def iter_records(file_path: str, table_names: Iterable[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Stream (table name, record) pairs from a JSON file without loading the whole document.
+
+    Requires ijson, which picks its fastest available backend (yajl2_c when built). The file is
+    scanned once per table, since iterating the top-level object with ijson.kvitems would build
+    each table's entire list; only one record is held in memory at a time.
+
+    :param file_path: Path to the JSON file.
+    :param table_names: The tables to read, in order.
+    :return: Iterator of (table name, record) pairs.
+    """
+    for table_name in table_names:
+        with open(file_path, "rb") as f:
+            # use_float keeps numbers as float rather than Decimal, which orjson cannot serialize
+            for record in ijson.items(f, f"{table_name}.item", use_float=True):
+                if not isinstance(record, dict):
+                    logger.warning(f"Record in table '{table_name}' is not a dictionary. Skipping.")
+                    continue
+                yield table_name, record
+
+
 def main():
     # Define the fixed path to perf_data.json relative to the script's directory
     script_dir = os.path.dirname(os.path.abspath(__file__))
     json_file_path = os.path.join(script_dir, "perf_data.json")
 
+    # Stream very large inputs record by record instead of parsing them into memory at once
+    if (ijson is not None and os.path.isfile(json_file_path)
+            and os.path.getsize(json_file_path) > STREAMING_THRESHOLD_BYTES):
+        inserter = DataInserter()
+        logger.info("Streaming data from perf_data.json:")
+        try:
+            inserter.insert_records(iter_records(json_file_path, list(inserter.table_configs)))
+        except ijson.JSONError as e:
+            logger.error(f"Error decoding JSON from file '{json_file_path}': {e}")
+        inserter.close()
+        return
+
     # Load data from the specified JSON file
     data = load_json_file(json_file_path)
     if not data:
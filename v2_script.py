@@ -1,3 +1,22 @@
+import json
+from typing import Any, Dict, List
+
+# Prefer orjson for serializing JSON, falling back to the standard library with the same compact,
+# unescaped output except for exponent floats (1e20 vs 1e+20) and NaN (null vs NaN). Values orjson
+# rejects, such as integers wider than 64 bits, are written by the standard library.
+try:
+    import orjson
+
+    def _dumps(value: Any) -> str:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+except ImportError:
+    def _dumps(value: Any) -> str:
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
 class DataInserter:
     """
     Class responsible for inserting and updating data into the database using InsightsDB.
@@ -47,7 +66,7 @@ class DataInserter:
         :return: Serialized JSON string or string representation of the value.
         """
         if isinstance(value, (dict, list)):
-            return json.dumps(value)
+            return _dumps(value)
         elif value is None:
             return ""
         else: